@@ -7,9 +7,16 @@ Backs up original feeds before making changes.
 import boto3
 import sys
 from datetime import datetime
-from xml.etree.ElementTree import fromstring, tostring, Element, register_namespace
 from collections import OrderedDict
 
+from feed_common import FEED_CACHE_CONTROL
+
+# lxml when installed, stdlib otherwise
+try:
+    from lxml.etree import fromstring, tostring, Element, register_namespace
+except ImportError:
+    from xml.etree.ElementTree import fromstring, tostring, Element, register_namespace
+
 # Register iTunes namespace to preserve it in the XML
 register_namespace('itunes', "http://www.itunes.com/dtds/podcast-1.0.dtd")
 
@@ -112,11 +119,12 @@ def cleanup_rss_feed(bucket_name: str, feed_key: str, dry_run: bool = False):
         backup_key = f"backups/{feed_key.replace('.xml', '')}_dedup_backup_{timestamp}.xml"
 
         print(f"\n💾 Creating backup at s3://{bucket_name}/{backup_key}...")
-        s3_client.put_object(
+        s3_client.copy_object(
             Bucket=bucket_name,
             Key=backup_key,
-            Body=original_content,
-            ContentType='application/rss+xml'
+            CopySource={'Bucket': bucket_name, 'Key': feed_key},
+            CopySourceIfMatch=feed_obj['ETag'],
+            MetadataDirective='COPY'
         )
 
         # Upload cleaned feed
@@ -125,7 +133,8 @@ def cleanup_rss_feed(bucket_name: str, feed_key: str, dry_run: bool = False):
             Bucket=bucket_name,
             Key=feed_key,
             Body=cleaned_xml.encode('utf-8'),
-            ContentType='application/rss+xml'
+            ContentType='application/rss+xml',
+            CacheControl=FEED_CACHE_CONTROL
         )
 
         print(f"✅ Successfully cleaned RSS feed: {feed_key}")
@@ -286,7 +286,7 @@ build_deployment_package() {
     log "Build directory: $BUILD_DIR"
 
     # Copy Python files
-    cp lambda_function.py "$BUILD_DIR/"
+    cp lambda_function.py feed_common.py "$BUILD_DIR/"
     cp requirements.txt "$BUILD_DIR/"
 
     # Install dependencies
@@ -0,0 +1,34 @@
+"""
+Settings shared by the Lambda function and the RSS feed maintenance scripts.
+Import-safe: nothing here talks to AWS until a helper is called.
+"""
+
+import threading
+
+import boto3
+from botocore.config import Config
+
+# Let CDNs and podcast clients cache the feed briefly; new episodes appear within minutes
+FEED_CACHE_CONTROL = 'public, max-age=300'
+
+# Keep-alive connections, a roomy pool and adaptive retries for the scripts' AWS clients
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    connect_timeout=3,
+    read_timeout=30
+)
+
+# boto3 Sessions are not thread-safe; serialize client/resource creation from a shared one
+SESSION_LOCK = threading.Lock()
+_SESSION = None
+
+
+def get_session():
+    """Return the process-wide boto3 Session, creating it on first use."""
+    global _SESSION
+    with SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = boto3.session.Session()
+        return _SESSION
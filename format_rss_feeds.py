@@ -7,8 +7,14 @@ Removes excessive blank lines and applies proper indentation.
 import boto3
 import sys
 from datetime import datetime
-from xml.etree.ElementTree import fromstring, tostring, register_namespace
-from xml.dom import minidom
+
+from feed_common import FEED_CACHE_CONTROL
+
+# lxml when installed, stdlib otherwise
+try:
+    from lxml.etree import fromstring, tostring, register_namespace, indent
+except ImportError:
+    from xml.etree.ElementTree import fromstring, tostring, register_namespace, indent
 
 # Register iTunes namespace to preserve it in the XML
 register_namespace('itunes', "http://www.itunes.com/dtds/podcast-1.0.dtd")
@@ -47,59 +53,11 @@ def format_rss_feed(bucket_name: str, feed_key: str, dry_run: bool = False):
         # Parse XML
         rss = fromstring(original_content)
 
-        # Convert to string first
-        rss_bytes = tostring(rss, encoding="utf-8", xml_declaration=False)
-
-        # Use minidom for pretty printing
-        dom = minidom.parseString(rss_bytes)
-        pretty_xml = dom.toprettyxml(indent="  ", encoding="utf-8")
-
-        # Clean up excessive blank lines from minidom output
-        # minidom sometimes adds extra blank lines, so we'll normalize them
-        xml_str = pretty_xml.decode('utf-8')
-
-        # Remove blank lines between XML tags
-        lines = xml_str.split('\n')
-        cleaned_lines = []
-        prev_blank = False
-
-        for line in lines:
-            # Check if line is blank or just whitespace
-            is_blank = len(line.strip()) == 0
-
-            # Skip consecutive blank lines
-            if is_blank and prev_blank:
-                continue
-
-            cleaned_lines.append(line)
-            prev_blank = is_blank
-
-        # Join back and ensure proper XML declaration
-        formatted_xml = '\n'.join(cleaned_lines)
-
-        # Ensure it starts with XML declaration
-        if not formatted_xml.startswith('<?xml'):
-            formatted_xml = '<?xml version="1.0" encoding="utf-8"?>\n' + formatted_xml
-
-        # Remove any leading blank lines after declaration
-        lines = formatted_xml.split('\n')
-        result_lines = [lines[0]]  # Keep XML declaration
-
-        # Skip blank lines after declaration
-        i = 1
-        while i < len(lines) and len(lines[i].strip()) == 0:
-            i += 1
-
-        # Add remaining lines
-        result_lines.extend(lines[i:])
-
-        formatted_xml = '\n'.join(result_lines)
-
-        # Final cleanup: ensure no more than one consecutive blank line
-        while '\n\n\n' in formatted_xml:
-            formatted_xml = formatted_xml.replace('\n\n\n', '\n\n')
-
-        formatted_bytes = formatted_xml.encode('utf-8')
+        # Re-indent in place: indent() replaces whitespace-only text and tails, so
+        # accumulated blank lines disappear without a second parse
+        indent(rss, space="\t")
+        formatted_bytes = tostring(rss, encoding="utf-8", xml_declaration=True)
+        formatted_xml = formatted_bytes.decode('utf-8')
         new_size = len(formatted_bytes)
         new_blank_lines = formatted_xml.count('\n\n')
 
@@ -124,11 +82,12 @@ def format_rss_feed(bucket_name: str, feed_key: str, dry_run: bool = False):
         backup_key = f"backups/{feed_key.replace('.xml', '')}_format_backup_{timestamp}.xml"
 
         print(f"\n💾 Creating backup at s3://{bucket_name}/{backup_key}...")
-        s3_client.put_object(
+        s3_client.copy_object(
             Bucket=bucket_name,
             Key=backup_key,
-            Body=original_content,
-            ContentType='application/rss+xml'
+            CopySource={'Bucket': bucket_name, 'Key': feed_key},
+            CopySourceIfMatch=feed_obj['ETag'],
+            MetadataDirective='COPY'
         )
 
         # Upload formatted feed
@@ -137,7 +96,8 @@ def format_rss_feed(bucket_name: str, feed_key: str, dry_run: bool = False):
             Bucket=bucket_name,
             Key=feed_key,
             Body=formatted_bytes,
-            ContentType='application/rss+xml'
+            ContentType='application/rss+xml',
+            CacheControl=FEED_CACHE_CONTROL
         )
 
         print(f"✅ Successfully formatted RSS feed: {feed_key}")
@@ -1,23 +1,39 @@
 import json
+import functools
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import email
+import html
 import base64
 import re
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple, Union
 import os
 import time
+import threading
 import logging
 import tempfile
+from io import BytesIO
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
-from xml.etree.ElementTree import fromstring, Element, SubElement, tostring, register_namespace
-from xml.dom import minidom
+from xml.sax.saxutils import XMLGenerator, escape, quoteattr
+
+from feed_common import FEED_CACHE_CONTROL
 
 # Import optional dependencies with fallbacks
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+    logging.warning("requests not available, Claude API calls will fail")
+
+try:
     from bs4 import BeautifulSoup
-    WEB_FETCHING_AVAILABLE = True
+    WEB_FETCHING_AVAILABLE = REQUESTS_AVAILABLE
 except ImportError:
     WEB_FETCHING_AVAILABLE = False
     logging.warning("Web fetching dependencies not available")
@@ -40,15 +56,154 @@ except ImportError:
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Register XML namespace for iTunes podcast tags
-register_namespace('itunes', "http://www.itunes.com/dtds/podcast-1.0.dtd")
+# iTunes podcast namespace, declared on the feed's <rss> element
+ITUNES_NAMESPACE = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+
+# Serialized RSS feed and its S3 ETag per (bucket, key), kept across warm Lambda invocations
+# so an unchanged feed is revalidated with a conditional GET (304) instead of re-downloaded
+_FEED_CACHE: Dict[Tuple[str, str], Tuple[str, bytes]] = {}
+
+# Shared S3 client so warm Lambda containers reuse its connection pool and TLS sessions
+_S3_CLIENT = boto3.client('s3', config=Config(
+    max_pool_connections=16,
+    retries={'max_attempts': 3, 'mode': 'standard'},
+    tcp_keepalive=True,
+))
+
+# Concurrent Polly synthesize_speech calls per episode
+POLLY_MAX_WORKERS = 8
+
+# Episode audio stays in memory up to this size before spilling to /tmp for upload
+AUDIO_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# Claude context window, and the margin kept between prompt and max_tokens
+CLAUDE_CONTEXT_WINDOW_TOKENS = 200000
+CLAUDE_CONTEXT_HEADROOM_TOKENS = 512
+
+# Concurrent Claude calls when summarizing independent email batches
+CLAUDE_BATCH_MAX_WORKERS = 4
+
+# Claude API statuses worth retrying: rate limited (429), transient server errors and overloaded (529)
+CLAUDE_RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 529})
+
+# Precompiled patterns for speech text preparation, episode descriptions and Polly chunking
+_SSML_BREAK_RE = re.compile(r'<break[^>]*/?>')
+_MD_HEADING_RE = re.compile(r'^#+\s*', re.MULTILINE)
+_MD_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+_MD_ITALIC_RE = re.compile(r'\*([^*]+)\*')
+_NUMBERED_LIST_RE = re.compile(r'^\d+\.\s*', re.MULTILINE)
+_URL_RE = re.compile(r'https?://[^\s]+')
+_DIVIDER_RE = re.compile(r'═+')
+_WHITESPACE_RE = re.compile(r'\s+')
+_SENTENCE_BREAK_RE = re.compile(r'([.!?])\s+')
+_SECTION_HEADING_RE = re.compile(
+    r'(TOP NEWS HEADLINES|DEEP DIVE ANALYSIS|Technical Deep Dive|Financial Analysis|'
+    r'Market Disruption|Cultural and Social Impact|Executive Action Plan)'
+)
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+_HTML_TAG_RE = re.compile('<.*?>')
+
+# Section headers in Claude responses, matched case-insensitively without lowercasing each line
+_SUMMARY_SECTION_RE = re.compile(r'executive summary|key themes|breaking news', re.IGNORECASE)
+_INSIGHTS_SECTION_RE = re.compile(r'insight|notable|must-read|links', re.IGNORECASE)
+_HEADLINES_SECTION_RE = re.compile(r'headlines', re.IGNORECASE)
+_DEEP_DIVE_SECTION_RE = re.compile(r'deep dive|analysis', re.IGNORECASE)
+_LIST_NUMBER_RE = re.compile(r'^\d+\.\s*')
+
+# Ordinal suffix for each day of the month, indexed by day (index 0 unused)
+_DAY_SUFFIX = tuple(
+    '' if day == 0 else 'th' if 4 <= day <= 20 or 24 <= day <= 30 else ['st', 'nd', 'rd'][day % 10 - 1]
+    for day in range(32)
+)
+
+# Display names for the Polly voices used as podcast hosts, keyed by lowercase voice ID
+_POLLY_HOST_NAMES = {
+    'joanna': 'Joanna',
+    'matthew': 'Matthew',
+    'amy': 'Amy',
+    'brian': 'Brian',
+}
+
+# Smart quotes normalized and characters that break SSML spelled out, in a single translate pass
+_SSML_UNSAFE_CHARS = str.maketrans({
+    '\u201c': '"',
+    '\u201d': '"',
+    '\u2018': "'",
+    '\u2019': "'",
+    '&': 'and',
+    '%': ' percent',
+    '$': 'dollar ',
+    '<': ' less than ',
+    '>': ' greater than ',
+})
+
+
+def _write_xml_element(gen: XMLGenerator, name: str, text: Optional[str] = None,
+                       attrs: Optional[Dict[str, str]] = None, depth: int = 0) -> None:
+    """Write one tab-indented leaf element straight to the XML stream"""
+    gen.ignorableWhitespace("\n" + "\t" * depth)
+    gen.startElement(name, attrs or {})
+    if text:
+        gen.characters(text)
+    gen.endElement(name)
+
+
+# Fixed <item> layout for new episodes, indented at channel depth; dynamic fields are escaped by the caller
+_RSS_ITEM_TEMPLATE = (
+    "\n\t\t<item>"
+    "\n\t\t\t<title>{title}</title>"
+    "\n\t\t\t<description>{description}</description>"
+    "\n\t\t\t<enclosure url={url} length=\"{length}\" type=\"audio/mpeg\"/>"
+    "\n\t\t\t<guid>{guid}</guid>"
+    "\n\t\t\t<pubDate>{pubdate}</pubDate>"
+    "\n\t\t\t<itunes:duration>{duration}</itunes:duration>"
+    "\n\t\t</item>"
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _rss_channel_header(podcast_title: str, image_url: str) -> bytes:
+    """Escape and serialize the fixed channel metadata once per container, up to the first <item>"""
+    buffer = BytesIO()
+    gen = XMLGenerator(buffer, encoding="utf-8", short_empty_elements=True)
+    gen.startDocument()
+    gen.startElement("rss", {"version": "2.0", "xmlns:itunes": ITUNES_NAMESPACE})
+    gen.ignorableWhitespace("\n\t")
+    gen.startElement("channel", {})
+
+    _write_xml_element(gen, "title", podcast_title, depth=2)
+    _write_xml_element(gen, "link", "https://dailyaibyai.news", depth=2)
+    _write_xml_element(gen, "language", "en-us", depth=2)
+    _write_xml_element(gen, "itunes:author", podcast_title, depth=2)
+    _write_xml_element(gen, "description", (
+        "Your daily AI newsletter summary in podcast format. "
+        "Comprehensive analysis of the latest developments in artificial intelligence, "
+        "delivered by a synthetic intelligence agent."
+    ), depth=2)
+    _write_xml_element(gen, "itunes:image", attrs={"href": image_url}, depth=2)
+    _write_xml_element(gen, "itunes:explicit", "false", depth=2)
+    _write_xml_element(gen, "itunes:category", attrs={"text": "Technology"}, depth=2)
+    _write_xml_element(gen, "itunes:category", attrs={"text": "News"}, depth=2)
+    return buffer.getvalue()
+
+
+class ClaudePromptTooLargeError(Exception):
+    """Raised when a prompt leaves too little of Claude's context window for the requested output"""
+
+
+@functools.lru_cache(maxsize=1)
+def _get_token_encoder():
+    """Load the tiktoken encoding once per container"""
+    return tiktoken.get_encoding("cl100k_base")  # Approximate for Claude
+
 
 class ClaudeNewsletterProcessor:
     def __init__(self, test_mode: bool = False, create_rss: bool = True):
         self.sqs_client = boto3.client('sqs')
         self.sns_client = boto3.client('sns')
         self.polly_client = boto3.client('polly')
-        self.s3_client = boto3.client('s3')
+        self.s3_client = _S3_CLIENT
         self.dynamodb = boto3.resource('dynamodb')
         
         # Environment variables
@@ -59,6 +214,9 @@ class ClaudeNewsletterProcessor:
         self.max_links_per_email = int(os.environ.get('MAX_LINKS_PER_EMAIL', '5'))
         self.dynamodb_table_name = os.environ.get('DYNAMODB_TABLE_NAME', 'ai_daily_news')
 
+        # One timestamp for the whole run, so the DynamoDB date, S3 key, GUID and spoken date always agree
+        self.run_timestamp = datetime.now()
+
         # Environment detection for staging
         self.environment = os.environ.get('ENVIRONMENT', 'production')
         self.s3_key_prefix = os.environ.get('S3_KEY_PREFIX', '')
@@ -70,11 +228,17 @@ class ClaudeNewsletterProcessor:
         self.claude_requests_per_minute = int(os.environ.get('CLAUDE_RPM_LIMIT', '5'))
         self.claude_max_retries = int(os.environ.get('CLAUDE_MAX_RETRIES', '6'))
         self.claude_base_delay = int(os.environ.get('CLAUDE_BASE_DELAY', '10'))
-        self.min_request_interval = 60 / self.claude_requests_per_minute # seconds between requests
-        self.last_request_time = 0
+        self.claude_max_delay = int(os.environ.get('CLAUDE_MAX_DELAY', '60'))
+        # Token bucket: refills at the RPM budget and allows bursts up to a minute's worth
+        self._rate_limit_capacity = float(self.claude_requests_per_minute)
+        self._rate_limit_tokens = self._rate_limit_capacity
+        self._rate_limit_refill_rate = self.claude_requests_per_minute / 60.0  # tokens per second
+        self._rate_limit_last_refill = time.monotonic()
+        self._rate_limit_lock = threading.Lock()
 
         # Polly and S3 configuration
         self.s3_bucket = os.environ.get('PODCAST_S3_BUCKET', 'ai-newsletter-podcasts')
+        self._s3_url_prefix = f"https://{self.s3_bucket}.s3.amazonaws.com/"
         self.polly_voice = os.environ.get('POLLY_VOICE', 'Joanna')
         self.polly_rate = os.environ.get('POLLY_RATE', 'medium')
         self.generate_audio = os.environ.get('GENERATE_AUDIO', 'true').lower() == 'true'
@@ -82,7 +246,7 @@ class ClaudeNewsletterProcessor:
         
         # RSS Feed configuration
         self.feed_key = os.environ.get('RSS_FEED_NAME', 'feed.xml')
-        self.podcast_image_url = os.environ.get('PODCAST_IMAGE_URL', f'https://{self.s3_bucket}.s3.amazonaws.com/podcast.png')
+        self.podcast_image_url = os.environ.get('PODCAST_IMAGE_URL', self._s3_url_prefix + 'podcast.png')
         
         # Test mode configuration (can be set via parameter or environment)
         self.test_mode = test_mode or os.environ.get('TEST_MODE', 'false').lower() == 'true'
@@ -97,13 +261,20 @@ class ClaudeNewsletterProcessor:
         # Claude API configuration
         self.claude_model = "claude-sonnet-4-5-20250929"  # You can change to claude-3-opus-20240229 for better quality
         self.claude_api_url = "https://api.anthropic.com/v1/messages"
+
+        # Keep-alive session so Claude calls reuse one TLS connection; retries are handled in _call_claude_api
+        if REQUESTS_AVAILABLE:
+            self.claude_session = requests.Session()
+            self.claude_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+        else:
+            self.claude_session = None
         
         # Token counting for Claude (with fallback)
         if TOKEN_COUNTING_AVAILABLE:
-            self.tokenizer = tiktoken.get_encoding("cl100k_base")  # Approximate for Claude
+            self.tokenizer = _get_token_encoder()
         else:
             self.tokenizer = None
-        self.max_tokens_per_batch = 800000  # Conservative limit for Claude context
+        self.max_tokens_per_batch = CLAUDE_CONTEXT_WINDOW_TOKENS  # Content that fits one Claude request
         
         # Validate required environment variables
         required_vars = ['EMAIL_QUEUE_URL', 'SNS_TOPIC_ARN', 'CLAUDE_API_KEY']
@@ -256,28 +427,57 @@ Take the single most important news item and provide comprehensive analysis cove
 Write as engaging podcast content for technology executives. Do NOT include any closing remarks or sign-offs.
 """
 
+    def _podcast_already_saved(self) -> bool:
+        """Check whether today's podcast is already in DynamoDB, i.e. the episode was published by an earlier run"""
+        current_date = self.run_timestamp.strftime('%Y-%m-%d')
+        try:
+            table = self.dynamodb.Table(self.dynamodb_table_name)
+            response = table.get_item(
+                Key={'date': current_date},
+                ProjectionExpression='#d',
+                ExpressionAttributeNames={'#d': 'date'}
+            )
+            return 'Item' in response
+        except Exception as e:
+            logger.warning(f"Could not check DynamoDB for an existing podcast on {current_date}: {str(e)}")
+            return False
+
     def save_podcast_to_dynamodb(self, text: str, episode_title: str = None) -> bool:
         """Save podcast text and episode title to DynamoDB with current date"""
         try:
             table = self.dynamodb.Table(self.dynamodb_table_name)
-            current_date = datetime.now().strftime('%Y-%m-%d')
+            current_date = self.run_timestamp.strftime('%Y-%m-%d')
 
             # Use generated title or fallback to date-based title
             if not episode_title:
                 episode_title = f"{self.podcast_title_short} Summary - {current_date}"
 
-            table.put_item(
-                Item={
+            put_kwargs = {
+                'Item': {
                     'date': current_date,
                     'text': text,
                     'episode_title': episode_title,
-                    'generated_at': datetime.now().isoformat()
+                    'generated_at': self.run_timestamp.isoformat()
                 }
-            )
+            }
+
+            # Never clobber a day that was already saved; test runs may overwrite freely
+            if not self.test_mode:
+                put_kwargs['ConditionExpression'] = 'attribute_not_exists(#d)'
+                put_kwargs['ExpressionAttributeNames'] = {'#d': 'date'}
+
+            table.put_item(**put_kwargs)
 
             logger.info(f"Successfully saved podcast text and title to DynamoDB table: {self.dynamodb_table_name}")
             return True
 
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                logger.warning(f"Podcast for {current_date} already saved in DynamoDB, keeping the existing entry")
+            else:
+                logger.error(f"Error saving to DynamoDB: {str(e)}")
+            return False
+
         except Exception as e:
             logger.error(f"Error saving to DynamoDB: {str(e)}")
             return False
@@ -290,6 +490,17 @@ Write as engaging podcast content for technology executives. Do NOT include any
             Processing results summary
         """
         try:
+            # A day that already has a published episode would only re-pay for Claude and Polly and
+            # overwrite its MP3; leave the queue untouched so new newsletters roll into the next episode
+            if self.generate_audio and not self.test_mode and self._podcast_already_saved():
+                logger.warning("Podcast for today already published, skipping processing")
+                return {
+                    'status': '⏭️ Already published',
+                    'total_emails': 0,
+                    'summary': "Today's episode was already published.",
+                    'processed_at': datetime.now().isoformat()
+                }
+
             # Get all messages from queue
             all_messages = self._get_all_queue_messages()
             
@@ -319,19 +530,19 @@ Write as engaging podcast content for technology executives. Do NOT include any
             # Apply hybrid processing strategy
             summary = self._hybrid_processing(enhanced_emails)
 
-            # Generate episode title from podcast content
+            # Generate episode title and podcast audio (if enabled) from podcast content; the title
+            # is produced in the background while Polly synthesizes, since only saving needs it
             episode_title = None
-            if summary.get('podcast_content'):
-                episode_title = self._generate_episode_title(summary['podcast_content'])
-
-            # Generate podcast audio if enabled
             audio_info = None
             if summary.get('podcast_content'):
-                audio_info = self._generate_podcast_audio(
-                    summary['podcast_content'],
-                    datetime.now().isoformat(),
-                    episode_title
-                )
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    title_future = executor.submit(self._generate_episode_title, summary['podcast_content'])
+                    audio_info = self._generate_podcast_audio(
+                        summary['podcast_content'],
+                        self.run_timestamp.isoformat(),
+                        title_future
+                    )
+                    episode_title = title_future.result()
             
             # Clean up processed messages (only in production mode)
             if not self.test_mode:
@@ -371,17 +582,29 @@ Write as engaging podcast content for technology executives. Do NOT include any
                 'processed_at': datetime.now().isoformat()
             }
     
+    def _refill_rate_limit_tokens(self):
+        """Add the tokens earned since the last refill, up to the bucket capacity"""
+        now = time.monotonic()
+        elapsed = now - self._rate_limit_last_refill
+        self._rate_limit_tokens = min(
+            self._rate_limit_capacity,
+            self._rate_limit_tokens + elapsed * self._rate_limit_refill_rate
+        )
+        self._rate_limit_last_refill = now
+
     def _enforce_rate_limit(self):
-        """Ensure we don't exceed rate limits"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        """Ensure we don't exceed rate limits, allowing short bursts within the RPM budget"""
+        # Held while sleeping too, so concurrent callers queue for tokens one at a time
+        with self._rate_limit_lock:
+            self._refill_rate_limit_tokens()
 
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            logger.info(f"Rate limiting: sleeping {sleep_time:.1f}s")
-            time.sleep(sleep_time)
+            if self._rate_limit_tokens < 1:
+                sleep_time = (1 - self._rate_limit_tokens) / self._rate_limit_refill_rate
+                logger.info(f"Rate limiting: sleeping {sleep_time:.1f}s")
+                time.sleep(sleep_time)
+                self._refill_rate_limit_tokens()
 
-        self.last_request_time = time.time()
+            self._rate_limit_tokens -= 1
 
     def _get_all_queue_messages(self) -> List[Dict[str, Any]]:
         """Retrieve all messages from SQS queue"""
@@ -522,10 +745,8 @@ Write as engaging podcast content for technology executives. Do NOT include any
         """Convert HTML to clean text"""
         if not WEB_FETCHING_AVAILABLE:
             # Simple HTML tag removal if BeautifulSoup not available
-            import re
             # Remove HTML tags
-            clean = re.compile('<.*?>')
-            text = re.sub(clean, '', html_content)
+            text = _HTML_TAG_RE.sub('', html_content)
             return text.strip()
         
         try:
@@ -720,24 +941,29 @@ Write as engaging podcast content for technology executives. Do NOT include any
 
             if estimated_tokens <= self.max_tokens_per_batch:
                 # Strategy 1: Single context processing - podcast only
-                podcast_content = self._single_context_podcast_processing(emails)
+                try:
+                    podcast_content = self._single_context_podcast_processing(emails)
 
-                return {
-                    'strategy_used': 'Single Context Processing (Podcast Only)',
-                    'podcast_content': podcast_content['content'],
-                    'podcast_headlines': podcast_content.get('headlines', []),
-                    'podcast_deep_dive': podcast_content.get('deep_dive', '')
-                }
-            else:
-                # Strategy 2: Batch processing with meta-summary - podcast only
-                podcast_content = self._batch_podcast_processing(emails)
+                    return {
+                        'strategy_used': 'Single Context Processing (Podcast Only)',
+                        'podcast_content': podcast_content['content'],
+                        'podcast_headlines': podcast_content.get('headlines', []),
+                        'podcast_deep_dive': podcast_content.get('deep_dive', '')
+                    }
+                except ClaudePromptTooLargeError as e:
+                    # The full prompt is larger than the content estimate; batching keeps each call in bounds
+                    logger.warning(f"Single context prompt too large ({str(e)}), falling back to batch processing")
 
-                return {
-                    'strategy_used': f'Batch Processing (Podcast Only, {len(self._create_smart_batches(emails))} batches)',
-                    'podcast_content': podcast_content['content'],
-                    'podcast_headlines': podcast_content.get('headlines', []),
-                    'podcast_deep_dive': podcast_content.get('deep_dive', '')
-                }
+            # Strategy 2: Batch processing with meta-summary - podcast only
+            batches = self._create_smart_batches(emails)
+            podcast_content = self._batch_podcast_processing(emails, batches)
+
+            return {
+                'strategy_used': f'Batch Processing (Podcast Only, {len(batches)} batches)',
+                'podcast_content': podcast_content['content'],
+                'podcast_headlines': podcast_content.get('headlines', []),
+                'podcast_deep_dive': podcast_content.get('deep_dive', '')
+            }
 
         except Exception as e:
             logger.error(f"Error in hybrid processing: {str(e)}")
@@ -802,16 +1028,9 @@ Content: {email['content'][:2000]}
             # Create smart batches
             batches = self._create_smart_batches(emails)
             
-            # Process each batch
-            batch_summaries = []
-            for i, batch in enumerate(batches):
-                try:
-                    batch_prompt = self._create_batch_prompt(batch, i + 1)
-                    batch_response = self._call_claude_api(batch_prompt)
-                    batch_summaries.append(batch_response)
-                except Exception as e:
-                    logger.error(f"Error processing batch {i + 1}: {str(e)}")
-                    continue
+            # Process the batches concurrently
+            batch_prompts = [self._create_batch_prompt(batch, i + 1) for i, batch in enumerate(batches)]
+            batch_summaries = self._call_claude_api_for_batches(batch_prompts, "batch")
             
             # Create meta-summary
             meta_prompt = self._create_meta_summary_prompt(batch_summaries, emails)
@@ -852,24 +1071,19 @@ Content: {email['content'][:2000]}
             logger.error(f"Error in single context podcast processing: {str(e)}")
             raise
     
-    def _batch_podcast_processing(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _batch_podcast_processing(self, emails: List[Dict[str, Any]],
+                                  batches: Optional[List[List[Dict[str, Any]]]] = None) -> Dict[str, Any]:
         """Process emails in batches for podcast format with meta-summary"""
         try:
             logger.info("Using batch podcast processing")
             
-            # Create smart batches
-            batches = self._create_smart_batches(emails)
+            # Create smart batches unless the caller already has them
+            if batches is None:
+                batches = self._create_smart_batches(emails)
             
-            # Process each batch for podcast content
-            batch_podcast_summaries = []
-            for i, batch in enumerate(batches):
-                try:
-                    batch_prompt = self._create_batch_podcast_prompt(batch, i + 1)
-                    batch_response = self._call_claude_api(batch_prompt)
-                    batch_podcast_summaries.append(batch_response)
-                except Exception as e:
-                    logger.error(f"Error processing podcast batch {i + 1}: {str(e)}")
-                    continue
+            # Process the batches for podcast content concurrently
+            batch_prompts = [self._create_batch_podcast_prompt(batch, i + 1) for i, batch in enumerate(batches)]
+            batch_podcast_summaries = self._call_claude_api_for_batches(batch_prompts, "podcast batch")
             
             # Create meta-podcast summary
             meta_prompt = self._create_meta_podcast_prompt(batch_podcast_summaries, emails)
@@ -886,6 +1100,24 @@ Content: {email['content'][:2000]}
             logger.error(f"Error in batch podcast processing: {str(e)}")
             raise
     
+    def _call_claude_api_for_batches(self, prompts: List[str], label: str) -> List[str]:
+        """Call Claude for independent batch prompts concurrently, keeping successful responses in order"""
+        def call_batch(i: int, prompt: str) -> Optional[str]:
+            try:
+                return self._call_claude_api(prompt)
+            except Exception as e:
+                logger.error(f"Error processing {label} {i + 1}: {str(e)}")
+                return None
+
+        if not prompts:
+            return []
+
+        # The token bucket in _enforce_rate_limit still paces the requests
+        with ThreadPoolExecutor(max_workers=min(CLAUDE_BATCH_MAX_WORKERS, len(prompts))) as executor:
+            responses = list(executor.map(call_batch, range(len(prompts)), prompts))
+
+        return [response for response in responses if response is not None]
+
     def _create_smart_batches(self, emails: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
         """Create smart batches based on token estimation"""
         batches = []
@@ -1100,6 +1332,15 @@ Content: {email['content']}
     def _call_claude_api(self, prompt: str, retry_count: int = 0, max_tokens: int = 4000,
                         temperature: float = 1.0, model: str = None) -> str:
         """Call Claude API with exponential backoff retry logic"""
+        # Refuse prompts that would leave less than max_tokens of output room rather than truncate the
+        # response; a prompt with fewer characters than the budget cannot exceed it, so only long ones are tokenized
+        prompt_budget = CLAUDE_CONTEXT_WINDOW_TOKENS - max_tokens - CLAUDE_CONTEXT_HEADROOM_TOKENS
+        if retry_count == 0 and len(prompt) > prompt_budget:
+            input_tokens = self._estimate_tokens(prompt)
+            if input_tokens > prompt_budget:
+                logger.warning(f"Prompt of ~{input_tokens} tokens leaves no room for {max_tokens} output tokens")
+                raise ClaudePromptTooLargeError(f"Prompt of ~{input_tokens} tokens exceeds the {prompt_budget}-token budget")
+
         try:
             # Enforce rate limiting before each request
             self._enforce_rate_limit()
@@ -1121,22 +1362,30 @@ Content: {email['content']}
                 ]
             }
             
-            response = requests.post(
-                self.claude_api_url,
-                headers=headers,
-                json=data,
-                timeout=360
-            )
-            
-            if response.status_code == 429:
+            # Timeouts, dropped connections and retryable statuses all share one backoff path
+            response = None
+            retry_reason = None
+            try:
+                response = self.claude_session.post(
+                    self.claude_api_url,
+                    headers=headers,
+                    json=data,
+                    timeout=360
+                )
+            except (requests.Timeout, requests.ConnectionError) as e:
+                retry_reason = type(e).__name__
+            else:
+                if response.status_code in CLAUDE_RETRYABLE_STATUS_CODES:
+                    retry_reason = f"HTTP {response.status_code}"
+
+            if retry_reason:
                 if retry_count < self.claude_max_retries:
-                    # Exponential backoff: base_delay * 2^retry_count
-                    delay = self.claude_base_delay * (2 ** retry_count)
-                    logger.warning(f"Rate limited (429). Retrying in {delay}s (attempt {retry_count + 1}/{self.claude_max_retries})")
+                    delay = self._get_claude_retry_delay(response, retry_count)
+                    logger.warning(f"Claude API failed ({retry_reason}). Retrying in {delay:.1f}s (attempt {retry_count + 1}/{self.claude_max_retries})")
                     time.sleep(delay)
                     return self._call_claude_api(prompt, retry_count + 1, max_tokens, temperature, model)
                 else:
-                    raise Exception(f"Max retries ({self.claude_max_retries}) exceeded for rate limiting")
+                    raise Exception(f"Max retries ({self.claude_max_retries}) exceeded ({retry_reason})")
             
             response.raise_for_status()
             result = response.json()
@@ -1147,6 +1396,35 @@ Content: {email['content']}
             logger.error(f"Error calling Claude API: {str(e)}")
             raise
     
+    def _get_claude_retry_delay(self, response, retry_count: int) -> float:
+        """Seconds to wait before retrying, preferring the wait the API asks for"""
+        headers = response.headers if response is not None else {}
+        server_delay = None
+        retry_after = headers.get('retry-after')
+        if retry_after:
+            try:
+                server_delay = float(retry_after)
+            except ValueError:
+                pass
+
+        if server_delay is None:
+            reset = headers.get('anthropic-ratelimit-requests-reset')
+            if reset:
+                try:
+                    reset_at = datetime.fromisoformat(reset.replace('Z', '+00:00'))
+                    server_delay = max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+                except (ValueError, TypeError):
+                    pass
+
+        # Jitter keeps workers sharing an API key from retrying in lockstep;
+        # a server-provided wait is only ever lengthened, never cut short
+        if server_delay is not None:
+            return server_delay * random.uniform(1.0, 1.2)
+
+        # Exponential backoff: base_delay * 2^retry_count, capped at CLAUDE_MAX_DELAY
+        delay = min(self.claude_base_delay * (2 ** retry_count), self.claude_max_delay)
+        return delay * random.uniform(0.8, 1.2)
+
     def _parse_claude_response(self, response: str) -> Dict[str, Any]:
         """Parse Claude's response to extract structured information"""
         try:
@@ -1163,13 +1441,17 @@ Content: {email['content']}
             for line in lines:
                 line = line.strip()
                 
+                if not line:
+                    current_content.append(line)
+                    continue
+                
                 # Detect section headers
-                if any(keyword in line.lower() for keyword in ['executive summary', 'key themes', 'breaking news']):
+                if _SUMMARY_SECTION_RE.search(line):
                     if current_content:
                         summary_sections.append('\n'.join(current_content))
                     current_content = [line]
                     current_section = "summary"
-                elif any(keyword in line.lower() for keyword in ['insight', 'notable', 'must-read', 'links']):
+                elif _INSIGHTS_SECTION_RE.search(line):
                     if current_content:
                         if current_section == "summary":
                             summary_sections.append('\n'.join(current_content))
@@ -1216,40 +1498,27 @@ Content: {email['content']}
             for line in lines:
                 line = line.strip()
                 
+                if not line:
+                    continue
+                
                 # Detect section headers
-                if any(keyword in line.lower() for keyword in ['top news headlines', 'headlines', 'news headlines']):
+                if _HEADLINES_SECTION_RE.search(line):
                     if current_content and current_section == "deep_dive":
                         deep_dive_content.extend(current_content)
                     current_content = []
                     current_section = "headlines"
-                elif any(keyword in line.lower() for keyword in ['deep dive analysis', 'deep dive', 'analysis']):
+                elif _DEEP_DIVE_SECTION_RE.search(line):
                     if current_content and current_section == "headlines":
-                        # Process headlines from current_content
-                        headline_text = '\n'.join(current_content)
-                        # Extract individual headlines (lines that look like news items)
-                        for content_line in current_content:
-                            content_line = content_line.strip()
-                            if content_line and not content_line.startswith('#') and len(content_line) > 20:
-                                # Clean up quote marks and numbering
-                                clean_headline = content_line.strip('"').strip("'")
-                                clean_headline = re.sub(r'^\d+\.\s*', '', clean_headline)
-                                if clean_headline:
-                                    headlines.append(clean_headline)
+                        headlines.extend(self._extract_headlines(current_content))
                     current_content = []
                     current_section = "deep_dive"
-                elif line and not line.startswith('#'):
+                elif not line.startswith('#'):
                     current_content.append(line)
             
             # Add final content
             if current_content:
                 if current_section == "headlines":
-                    for content_line in current_content:
-                        content_line = content_line.strip()
-                        if content_line and not content_line.startswith('#') and len(content_line) > 20:
-                            clean_headline = content_line.strip('"').strip("'")
-                            clean_headline = re.sub(r'^\d+\.\s*', '', clean_headline)
-                            if clean_headline:
-                                headlines.append(clean_headline)
+                    headlines.extend(self._extract_headlines(current_content))
                 elif current_section == "deep_dive":
                     deep_dive_content.extend(current_content)
             
@@ -1270,9 +1539,26 @@ Content: {email['content']}
                 'deep_dive': response
             }
 
+    def _extract_headlines(self, content_lines: List[str]) -> List[str]:
+        """Extract individual headlines (lines that look like news items) from a headlines section"""
+        headlines = []
+        for content_line in content_lines:
+            content_line = content_line.strip()
+            if content_line and not content_line.startswith('#') and len(content_line) > 20:
+                # Clean up quote marks and numbering
+                clean_headline = content_line.strip('"').strip("'")
+                clean_headline = _LIST_NUMBER_RE.sub('', clean_headline)
+                if clean_headline:
+                    headlines.append(clean_headline)
+        return headlines
+
     def _generate_episode_title(self, podcast_script: str) -> str:
         """Generate a compelling episode title using Claude Haiku"""
         try:
+            if not podcast_script.strip():
+                logger.warning("Podcast script is empty, nothing to title")
+                return self._fallback_episode_title()
+
             logger.info("Generating episode title with Claude Haiku...")
 
             # Construct prompt for title generation
@@ -1334,95 +1620,121 @@ EPISODE TITLE:"""
 
         except Exception as e:
             logger.error(f"Error generating episode title: {str(e)}")
-            # Fallback to date-based title
-            current_date = datetime.now().strftime('%B %d, %Y')
-            fallback_title = f"{self.podcast_title_short} Summary - {current_date}"
-            logger.info(f"Using fallback title: {fallback_title}")
-            return fallback_title
+            return self._fallback_episode_title()
+
+    def _fallback_episode_title(self) -> str:
+        """Date-based episode title used when Claude cannot produce one"""
+        current_date = self.run_timestamp.strftime('%B %d, %Y')
+        fallback_title = f"{self.podcast_title_short} Summary - {current_date}"
+        logger.info(f"Using fallback title: {fallback_title}")
+        return fallback_title
 
     def _chunk_text_for_polly(self, text: str, max_length: int = 2800) -> List[str]:
         """Chunk text for Polly synthesis (based on reference.py)"""
-        import re
-        
         # Split into sentences (with punctuation)
-        sentence_endings = re.compile(r'(?<=[.!?])\s+')
-        sentences = sentence_endings.split(text.strip())
+        sentences = _SENTENCE_SPLIT_RE.split(text.strip())
         
         chunks = []
-        current = ""
+        current_parts = []
+        current_length = 0  # length of the chunk so far, counting a space after each sentence
 
         for sentence in sentences:
             sentence = sentence.strip()
             if not sentence:
                 continue
 
-            if len(current) + len(sentence) + 1 <= max_length:
-                current += sentence + " "
+            sentence_length = len(sentence) + 1
+            if current_length + sentence_length <= max_length:
+                current_parts.append(sentence)
+                current_length += sentence_length
             else:
-                if current:
-                    chunks.append(current.strip())
-                current = sentence + " "
+                if current_parts:
+                    chunks.append(' '.join(current_parts))
+                current_parts = [sentence]
+                current_length = sentence_length
 
-        if current:
-            chunks.append(current.strip())
+        if current_parts:
+            chunks.append(' '.join(current_parts))
 
         return chunks
     
     def _convert_text_to_speech(self, text: str, voice_id: str = None, rate: str = None) -> bytes:
         """Convert text to speech using AWS Polly (based on reference.py)"""
+        audio_buffer = BytesIO()
+        self._write_speech_audio(text, audio_buffer, voice_id, rate)
+        return audio_buffer.getvalue()
+    
+    def _write_speech_audio(self, text: str, audio_file, voice_id: str = None, rate: str = None) -> int:
+        """Synthesize text with AWS Polly, writing MP3 chunks to audio_file in order; returns bytes written"""
         try:
             voice_id = voice_id or self.polly_voice
             rate = rate or self.polly_rate
             
-            full_audio = b''
             chunks = self._chunk_text_for_polly(text)
             
             logger.info(f"Converting {len(chunks)} text chunks to speech using voice {voice_id}")
             
-            for i, chunk in enumerate(chunks):
-                try:
-                    # Create SSML with prosody for natural speech
-                    ssml_text = f"<speak><prosody rate='{rate}'>{chunk}</prosody></speak>"
-                    
-                    polly_response = self.polly_client.synthesize_speech(
-                        Text=ssml_text,
-                        TextType='ssml',
-                        OutputFormat='mp3',
-                        VoiceId=voice_id
-                    )
-                    
-                    chunk_audio = polly_response['AudioStream'].read()
-                    full_audio += chunk_audio
-                    
-                    logger.info(f"Processed chunk {i+1}/{len(chunks)}, size: {len(chunk_audio)} bytes")
-                    
-                except Exception as e:
-                    logger.error(f"Error processing chunk {i+1}: {str(e)}")
-                    # Continue with other chunks
-                    continue
+            if not chunks:
+                return 0
             
-            logger.info(f"Total audio size: {len(full_audio)} bytes")
-            return full_audio
+            # Chunks are independent, so overlap the Polly round-trips; map yields them in order,
+            # so each chunk is written out as soon as it and its predecessors are ready
+            audio_size = 0
+            with ThreadPoolExecutor(max_workers=min(POLLY_MAX_WORKERS, len(chunks))) as executor:
+                for chunk_audio in executor.map(
+                    lambda indexed_chunk: self._synthesize_chunk(*indexed_chunk, len(chunks), voice_id, rate),
+                    enumerate(chunks)
+                ):
+                    audio_file.write(chunk_audio)
+                    audio_size += len(chunk_audio)
+            
+            logger.info(f"Total audio size: {audio_size} bytes")
+            return audio_size
             
         except Exception as e:
             logger.error(f"Error converting text to speech: {str(e)}")
             raise
     
-    def _upload_audio_to_s3(self, audio_data: bytes, date_str: str) -> Tuple[str, str]:
-        """Upload audio to S3 and return key and presigned URL"""
+    def _synthesize_chunk(self, i: int, chunk: str, total_chunks: int, voice_id: str, rate: str) -> bytes:
+        """Synthesize a single text chunk, returning empty audio on failure"""
+        try:
+            # Create SSML with prosody for natural speech
+            ssml_text = f"<speak><prosody rate='{rate}'>{chunk}</prosody></speak>"
+            
+            polly_response = self.polly_client.synthesize_speech(
+                Text=ssml_text,
+                TextType='ssml',
+                OutputFormat='mp3',
+                VoiceId=voice_id
+            )
+            
+            chunk_audio = polly_response['AudioStream'].read()
+            
+            logger.info(f"Processed chunk {i+1}/{total_chunks}, size: {len(chunk_audio)} bytes")
+            return chunk_audio
+            
+        except Exception as e:
+            logger.error(f"Error processing chunk {i+1}: {str(e)}")
+            # Continue with other chunks
+            return b''
+    
+    def _upload_audio_to_s3(self, audio_file, date_str: str) -> Tuple[str, str]:
+        """Upload an audio file object to S3 and return key and presigned URL"""
         try:
             # Create filename with date
             audio_key = f"{self.s3_key_prefix}podcasts/ai-newsletter-{date_str}.mp3"
             
-            # Upload to S3
-            self.s3_client.put_object(
-                Bucket=self.s3_bucket,
-                Key=audio_key,
-                Body=audio_data,
-                ContentType='audio/mpeg',
-                Metadata={
-                    'generated_at': datetime.now().isoformat(),
-                    'content_type': 'ai_newsletter_podcast'
+            # Upload to S3; upload_fileobj switches to a parallel multipart upload for large episodes
+            self.s3_client.upload_fileobj(
+                audio_file,
+                self.s3_bucket,
+                audio_key,
+                ExtraArgs={
+                    'ContentType': 'audio/mpeg',
+                    'Metadata': {
+                        'generated_at': self.run_timestamp.isoformat(),
+                        'content_type': 'ai_newsletter_podcast'
+                    }
                 }
             )
             
@@ -1440,8 +1752,9 @@ EPISODE TITLE:"""
             logger.error(f"Error uploading audio to S3: {str(e)}")
             raise
     
-    def _generate_podcast_audio(self, podcast_content: str, processed_date: str, episode_title: str = None) -> Optional[Dict[str, str]]:
-        """Generate MP3 audio from podcast content"""
+    def _generate_podcast_audio(self, podcast_content: str, processed_date: str,
+                                episode_title: Optional[Union[str, Future]] = None) -> Optional[Dict[str, str]]:
+        """Generate MP3 audio from podcast content; episode_title may be a Future still being generated"""
         if not self.generate_audio:
             logger.info("Audio generation disabled")
             return None
@@ -1457,25 +1770,30 @@ EPISODE TITLE:"""
                 logger.warning("No content available for audio generation")
                 return None
             
-            # Save cleaned podcast text and title to DynamoDB
+            # Convert to speech, spooling the audio so a long episode is never held in memory twice
+            with tempfile.SpooledTemporaryFile(max_size=AUDIO_SPOOL_MAX_BYTES) as audio_file:
+                audio_size = self._write_speech_audio(clean_text, audio_file)
+                
+                if not audio_size:
+                    logger.warning("No audio data generated")
+                    return None
+                
+                # Upload to S3
+                audio_file.seek(0)
+                date_str = datetime.fromisoformat(processed_date.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+                audio_key, presigned_url = self._upload_audio_to_s3(audio_file, date_str)
+            
+            # Save cleaned podcast text and title to DynamoDB only once the audio is in S3; the record
+            # marks the day as published, so a failed synthesis or upload can be retried by a later run
+            if isinstance(episode_title, Future):
+                episode_title = episode_title.result()
             self.save_podcast_to_dynamodb(clean_text, episode_title)
             
-            # Convert to speech
-            audio_data = self._convert_text_to_speech(clean_text)
-            
-            if not audio_data:
-                logger.warning("No audio data generated")
-                return None
-            
-            # Upload to S3
-            date_str = datetime.fromisoformat(processed_date.replace('Z', '+00:00')).strftime('%Y-%m-%d')
-            audio_key, presigned_url = self._upload_audio_to_s3(audio_data, date_str)
-            
             # Update RSS feed only if enabled
             if self.create_rss:
                 episode_date = datetime.fromisoformat(processed_date.replace('Z', '+00:00'))
                 episode_description = self._create_episode_description(podcast_content)
-                self._update_rss_feed(audio_key, len(audio_data), episode_description, episode_date, episode_title)
+                self._update_rss_feed(audio_key, audio_size, episode_description, episode_date, episode_title)
                 logger.info("RSS feed updated with new episode")
             else:
                 logger.info("RSS feed update skipped (create_rss=false)")
@@ -1483,7 +1801,7 @@ EPISODE TITLE:"""
             return {
                 'audio_key': audio_key,
                 'audio_url': presigned_url,
-                'audio_size': len(audio_data)
+                'audio_size': audio_size
             }
             
         except Exception as e:
@@ -1492,35 +1810,16 @@ EPISODE TITLE:"""
     
     def _prepare_text_for_speech(self, text: str) -> str:
         """Prepare text for speech synthesis by cleaning markdown and formatting"""
-        import re
-        import html
-        from datetime import datetime
-        
         # Get current date information for podcast intro
-        now = datetime.now()
-        day_name = now.strftime('%A')
-        date_formatted = now.strftime('%B %d')
+        now = self.run_timestamp
+        day_name, month_name = now.strftime('%A|%B').split('|')
         
         # Add ordinal suffix to day
-        day = now.day
-        if 4 <= day <= 20 or 24 <= day <= 30:
-            suffix = "th"
-        else:
-            suffix = ["st", "nd", "rd"][day % 10 - 1]
-        date_formatted = now.strftime(f'%B {day}{suffix}')
+        date_formatted = f"{month_name} {now.day}{_DAY_SUFFIX[now.day]}"
         
         # Get host name from Polly voice
         voice_name = self.polly_voice
-        if voice_name.lower() == 'joanna':
-            host_name = "Joanna, a synthetic intelligence agent"
-        elif voice_name.lower() == 'matthew':
-            host_name = "Matthew, a synthetic intelligence agent"
-        elif voice_name.lower() == 'amy':
-            host_name = "Amy, a synthetic intelligence agent"
-        elif voice_name.lower() == 'brian':
-            host_name = "Brian, a synthetic intelligence agent"
-        else:
-            host_name = f"{voice_name}, a synthetic intelligence agent"
+        host_name = f"{_POLLY_HOST_NAMES.get(voice_name.lower(), voice_name)}, a synthetic intelligence agent"
         
         # Create podcast introduction and outro (clean text)
         env_notice = "This is a staging test. " if self.environment == 'staging' else ""
@@ -1528,32 +1827,24 @@ EPISODE TITLE:"""
         outro = f"That's all for today's {self.podcast_title}. I'm {host_name}, and I'll be back tomorrow with more AI insights. Until then, keep innovating."
         
         # STEP 1: Remove existing SSML tags (they'll be re-added properly)
-        text = re.sub(r'<break[^>]*/?>', ' ', text)
+        text = _SSML_BREAK_RE.sub(' ', text)
         
         # STEP 2: Remove markdown formatting
-        text = re.sub(r'^#+\s*', '', text, flags=re.MULTILINE)
-        text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-        text = re.sub(r'\*([^*]+)\*', r'\1', text)
-        text = re.sub(r'^\d+\.\s*', '', text, flags=re.MULTILINE)
+        text = _MD_HEADING_RE.sub('', text)
+        text = _MD_BOLD_RE.sub(r'\1', text)
+        text = _MD_ITALIC_RE.sub(r'\1', text)
+        text = _NUMBERED_LIST_RE.sub('', text)
         
         # STEP 3: Handle problematic characters for SSML
-        # Replace smart quotes with regular quotes
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace(''', "'").replace(''', "'")
-        
-        # Replace characters that break SSML
-        text = text.replace('&', 'and')
-        text = text.replace('%', ' percent')
-        text = text.replace('$', 'dollar ')
-        text = text.replace('<', ' less than ')
-        text = text.replace('>', ' greater than ')
+        # Replace smart quotes with regular quotes and spell out characters that break SSML
+        text = text.translate(_SSML_UNSAFE_CHARS)
         
         # STEP 4: Clean up URLs and section dividers
-        text = re.sub(r'https?://[^\s]+', 'link', text)
-        text = re.sub(r'═+', ' ', text)
+        text = _URL_RE.sub('link', text)
+        text = _DIVIDER_RE.sub(' ', text)
         
         # STEP 5: Clean up whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         
         # STEP 6: HTML escape all content for SSML safety
         text = html.escape(text, quote=False)
@@ -1561,9 +1852,8 @@ EPISODE TITLE:"""
         outro = html.escape(outro, quote=False)
         
         # STEP 7: Add SSML breaks with CONSISTENT double quotes
-        text = re.sub(r'([.!?])\s+', r'\1 <break time="0.5s"/> ', text)
-        text = re.sub(r'(TOP NEWS HEADLINES|DEEP DIVE ANALYSIS)', r'<break time="1s"/> \1 <break time="1s"/>', text)
-        text = re.sub(r'(Technical Deep Dive|Financial Analysis|Market Disruption|Cultural and Social Impact|Executive Action Plan)', r'<break time="1s"/> \1 <break time="1s"/>', text)
+        text = _SENTENCE_BREAK_RE.sub(r'\1 <break time="0.5s"/> ', text)
+        text = _SECTION_HEADING_RE.sub(r'<break time="1s"/> \1 <break time="1s"/>', text)
         
         # STEP 8: Combine with consistent SSML
         full_podcast = f'{intro} <break time="2s"/> {text} <break time="2s"/> {outro}'
@@ -1575,15 +1865,13 @@ EPISODE TITLE:"""
         """Create a concise episode description from podcast content"""
         try:
             # Extract first few sentences as description
-            import re
-            
             # Remove markdown and clean up text
-            clean_content = re.sub(r'^#+\s*', '', podcast_content, flags=re.MULTILINE)
-            clean_content = re.sub(r'\*\*([^*]+)\*\*', r'\1', clean_content)
-            clean_content = re.sub(r'\*([^*]+)\*', r'\1', clean_content)
+            clean_content = _MD_HEADING_RE.sub('', podcast_content)
+            clean_content = _MD_BOLD_RE.sub(r'\1', clean_content)
+            clean_content = _MD_ITALIC_RE.sub(r'\1', clean_content)
             
             # Split into sentences and take first 2-3
-            sentences = re.split(r'[.!?]+', clean_content)
+            sentences = _SENTENCE_END_RE.split(clean_content)
             description_sentences = []
             char_count = 0
             
@@ -1608,10 +1896,8 @@ EPISODE TITLE:"""
 
     def _format_duration(self, seconds: float) -> str:
         """Format duration in seconds to HH:MM:SS or MM:SS format for iTunes."""
-        total_seconds = int(seconds)
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        secs = total_seconds % 60
+        minutes, secs = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
 
         if hours > 0:
             return f"{hours}:{minutes:02d}:{secs:02d}"
@@ -1663,81 +1949,102 @@ EPISODE TITLE:"""
     def _update_rss_feed(self, audio_key: str, audio_size: int, episode_description: str, episode_date: datetime, episode_title: str = None) -> None:
         """Update RSS feed with new podcast episode (based on reference.py)"""
         try:
-            # Try to get existing feed
-            try:
-                feed_obj = self.s3_client.get_object(Bucket=self.s3_bucket, Key=self.feed_key)
-                rss = fromstring(feed_obj['Body'].read())
-                channel = rss.find('channel')
-                logger.info("Found existing RSS feed, updating...")
-            except Exception:
-                # Create new feed if it doesn't exist
-                logger.info("Creating new RSS feed...")
-                rss = Element("rss", version="2.0", attrib={"xmlns:itunes": "http://www.itunes.com/dtds/podcast-1.0.dtd"})
-                channel = SubElement(rss, "channel")
-
-                # Add channel metadata
-                SubElement(channel, "title").text = self.podcast_title
-                SubElement(channel, "link").text = "https://dailyaibyai.news"
-                SubElement(channel, "language").text = "en-us"
-                SubElement(channel, "itunes:author").text = self.podcast_title
-                SubElement(channel, "description").text = (
-                    "Your daily AI newsletter summary in podcast format. "
-                    "Comprehensive analysis of the latest developments in artificial intelligence, "
-                    "delivered by a synthetic intelligence agent."
-                )
-                SubElement(channel, "itunes:image", href=self.podcast_image_url)
-                SubElement(channel, "itunes:explicit").text = "false"
-                SubElement(channel, "itunes:category", text="Technology")
-                SubElement(channel, "itunes:category", text="News")
-            
-            # Create new episode item
-            item = SubElement(channel, "item")
+            # Take any cached feed out while it is being updated; it goes back only after a successful upload
+            cache_key = (self.s3_bucket, self.feed_key)
+            cached_feed = _FEED_CACHE.pop(cache_key, None)
+
+            # The duration lookup downloads the episode MP3, so run it alongside the feed GET
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                duration_future = executor.submit(self._get_audio_duration_from_s3, audio_key)
+
+                # Try to get existing feed, skipping the download when the cached copy is still current
+                feed_bytes = None
+                feed_etag = None
+                try:
+                    get_kwargs = {'IfNoneMatch': cached_feed[0]} if cached_feed else {}
+                    feed_obj = self.s3_client.get_object(Bucket=self.s3_bucket, Key=self.feed_key, **get_kwargs)
+                    feed_bytes = feed_obj['Body'].read()
+                    feed_etag = feed_obj['ETag']
+                    logger.info("Found existing RSS feed, updating...")
+                except ClientError as e:
+                    if cached_feed and e.response.get('ResponseMetadata', {}).get('HTTPStatusCode') == 304:
+                        feed_etag, feed_bytes = cached_feed
+                        logger.info("RSS feed unchanged since last update, reusing cached copy...")
+                except Exception:
+                    pass
+
+                duration = duration_future.result()
 
-            # Episode title - use generated title or fallback to date-based
+            # Create new episode item
             if not episode_title:
                 episode_title = f"{self.podcast_title_short} Summary - {episode_date.strftime('%B %d, %Y')}"
-            SubElement(item, "title").text = episode_title
-            
-            # Episode description
-            SubElement(item, "description").text = episode_description
-            
-            # Audio enclosure
-            audio_url = f"https://{self.s3_bucket}.s3.amazonaws.com/{audio_key}"
-            SubElement(item, "enclosure", 
-                      url=audio_url,
-                      length=str(audio_size), 
-                      type="audio/mpeg")
-            
-            # Unique episode GUID
-            guid_prefix = 'staging-daily-ai' if self.environment == 'staging' else 'daily-ai'
-            episode_guid = f"{guid_prefix}-{episode_date.strftime('%Y%m%d')}"
-            SubElement(item, "guid").text = episode_guid
+            episode_guid = self._get_episode_guid(episode_date)
+            item_bytes = self._create_rss_item(audio_key, audio_size, episode_description, episode_guid, episode_date, episode_title, duration)
+
+            # The audio at this episode's key was just replaced, so an item already carrying its GUID
+            # (e.g. a test re-run) is swapped for the new one rather than duplicated or left stale
+            guid_index = feed_bytes.find(f"<guid>{episode_guid}</guid>".encode("utf-8")) if feed_bytes is not None else -1
+            item_start = feed_bytes.rfind(b'<item>', 0, guid_index) if guid_index != -1 else -1
+            item_end = feed_bytes.find(b'</item>', guid_index) if item_start != -1 else -1
+
+            channel_end = feed_bytes.rfind(b'</channel>') if feed_bytes is not None else -1
+            if item_end != -1:
+                logger.info(f"Episode {episode_guid} already in RSS feed, replacing its item")
+                item_end += len(b'</item>')
+                pretty_xml = b''.join((feed_bytes[:item_start].rstrip(), item_bytes, feed_bytes[item_end:]))
+            elif channel_end != -1:
+                # Only the newest item changes, so splice it in before </channel> instead of
+                # parsing and re-serializing every historical episode
+                pretty_xml = b''.join((feed_bytes[:channel_end].rstrip(), item_bytes, b'\n\t', feed_bytes[channel_end:]))
+            else:
+                # Create new feed if it doesn't exist, around the pre-serialized channel metadata
+                logger.info("Creating new RSS feed...")
+                channel_header = _rss_channel_header(self.podcast_title, self.podcast_image_url)
+                pretty_xml = b''.join((channel_header, item_bytes, b'\n\t</channel>\n</rss>'))
             
-            # Publication date in RFC 2822 format
-            pubdate = episode_date.strftime("%a, %d %b %Y %H:%M:%S +0000")
-            SubElement(item, "pubDate").text = pubdate
-
-            # Calculate real duration from audio file on S3
-            duration = self._get_audio_duration_from_s3(audio_key)
-            SubElement(item, "itunes:duration").text = duration
-            
-            # Convert to pretty XML
-            rss_bytes = tostring(rss, encoding="utf-8", xml_declaration=True)
-            pretty_xml = minidom.parseString(rss_bytes).toprettyxml(encoding="utf-8")
-            
-            # Upload updated feed to S3
-            self.s3_client.put_object(
-                Bucket=self.s3_bucket, 
-                Key=self.feed_key, 
-                Body=pretty_xml, 
-                ContentType='application/rss+xml'
-            )
+            # Upload updated feed to S3, only if it is still the version read above (or still absent),
+            # so a concurrent run or maintenance script is never silently overwritten
+            put_condition = {'IfMatch': feed_etag} if feed_etag else {'IfNoneMatch': '*'}
+            try:
+                put_response = self.s3_client.put_object(
+                    Bucket=self.s3_bucket, 
+                    Key=self.feed_key, 
+                    Body=pretty_xml, 
+                    ContentType='application/rss+xml',
+                    CacheControl=FEED_CACHE_CONTROL,
+                    **put_condition
+                )
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                    logger.error(f"RSS feed changed while adding episode '{episode_title}', update skipped to avoid overwriting it")
+                    return
+                raise
+            _FEED_CACHE[cache_key] = (put_response['ETag'], pretty_xml)
             
             logger.info(f"RSS feed updated successfully with episode: {episode_title}")
             
         except Exception as e:
             logger.error(f"Error updating RSS feed: {str(e)}")
             # Don't raise - RSS feed update failure shouldn't stop the main process
+
+    def _get_episode_guid(self, episode_date: datetime) -> str:
+        """Unique episode GUID, one per day and environment"""
+        guid_prefix = 'staging-daily-ai' if self.environment == 'staging' else 'daily-ai'
+        return f"{guid_prefix}-{episode_date.strftime('%Y%m%d')}"
+
+    def _create_rss_item(self, audio_key: str, audio_size: int, episode_description: str, episode_guid: str, episode_date: datetime, episode_title: str, duration: str) -> bytes:
+        """Serialize the <item> for a new podcast episode, indented at channel depth"""
+        return _RSS_ITEM_TEMPLATE.format(
+            title=escape(episode_title),
+            description=escape(episode_description),
+            url=quoteattr(self._s3_url_prefix + audio_key),
+            length=audio_size,
+            guid=episode_guid,
+            # Publication date in RFC 2822 format
+            pubdate=episode_date.strftime("%a, %d %b %Y %H:%M:%S +0000"),
+            # Real duration measured from the audio file on S3
+            duration=duration,
+        ).encode("utf-8")
     
     def _cleanup_messages(self, processed_messages: List[Dict[str, Any]]) -> None:
         """Delete processed messages from SQS queue"""
@@ -1778,6 +2085,8 @@ EPISODE TITLE:"""
                 message_body = self._create_success_email(result_data)
             elif result_data['status'] == '📭 No emails found':
                 message_body = self._create_no_emails_notification(result_data)
+            elif result_data['status'] == '⏭️ Already published':
+                message_body = self._create_already_published_notification(result_data)
             elif result_data['status'] == '❌ Failure':
                 message_body = self._create_error_email(result_data)
             else:
@@ -1812,7 +2121,7 @@ EPISODE TITLE:"""
         audio_size = result_data.get('audio_size', 0)
 
         env_badge = "🧪 [STAGING TEST] " if self.environment == 'staging' else ""
-        message = f"""{env_badge}🎙️ AI Podcast Summary - {datetime.now().strftime('%B %d, %Y')}
+        message = f"""{env_badge}🎙️ AI Podcast Summary - {self.run_timestamp.strftime('%B %d, %Y')}
 
 📊 Processed: {result_data['total_emails']} newsletters
 🔧 Strategy: {result_data.get('processing_strategy', 'Unknown')}"""
@@ -1899,14 +2208,31 @@ This is normal and means:
 
 Next scheduled check: {self._get_next_run_time() if self.environment == 'production' else 'Manual invocation only (staging)'}
 
+No action required.
+"""
+
+    def _create_already_published_notification(self, result_data: Dict[str, Any]) -> str:
+        """Create informational email for when today's episode was already published"""
+        processed_at = result_data['processed_at']
+        env_badge = "🧪 [STAGING TEST] " if self.environment == 'staging' else ""
+
+        return f"""{env_badge}⏭️ Today's Episode Already Published
+
+✅ System Status: Healthy
+⏰ Checked at: {processed_at}
+
+A podcast for {self.run_timestamp.strftime('%B %d, %Y')} is already saved in DynamoDB, so this run
+did not summarize, synthesize or update the RSS feed again.
+
+Newsletters waiting in the queue were left in place and will be included in the next episode.
+
 No action required.
 """
 
     def _get_next_run_time(self) -> str:
         """Calculate next scheduled run time"""
-        from datetime import datetime, timedelta
         # Scheduled daily at 10:00 UTC
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         next_run = now.replace(hour=10, minute=0, second=0, microsecond=0)
         if now.hour >= 10:
             next_run += timedelta(days=1)
@@ -1935,6 +2261,7 @@ def lambda_handler(event, context):
     if not create_rss_from_event:
         logger.info("⚠️  RSS CREATION DISABLED (from event JSON)")
     
+    processor = None
     try:
         processor = ClaudeNewsletterProcessor(test_mode=test_mode, create_rss=create_rss_from_event)
         result_message = processor.process_newsletter_queue()
@@ -1943,7 +2270,7 @@ def lambda_handler(event, context):
         
         return {
             'statusCode': 200,
-            'body': json.dumps(result_message, indent=2)
+            'body': json.dumps(result_message, separators=(',', ':'))
         }
         
     except Exception as e:
@@ -1956,14 +2283,15 @@ def lambda_handler(event, context):
         
         return {
             'statusCode': 500,
-            'body': json.dumps(result_message, indent=2)
+            'body': json.dumps(result_message, separators=(',', ':'))
         }
     
     finally:
         try:
             if result_message:
-                # Create a new processor instance for sending email (test mode doesn't matter for email sending)
-                email_processor = ClaudeNewsletterProcessor(create_rss=create_rss_from_event)
+                # Reuse the run's processor for the email; only build one if construction itself failed
+                # (test mode doesn't matter for email sending)
+                email_processor = processor or ClaudeNewsletterProcessor(create_rss=create_rss_from_event)
                 email_processor.send_summary_email(result_message)
         except Exception as e:
             logger.error(f"Failed to send summary email: {str(e)}")
@@ -1,18 +1,50 @@
 import json
 import os
 import glob
+import hashlib
+import shutil
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import List, Dict, Any, Optional, Iterator
 import logging
 from pathlib import Path
+from xml.etree.ElementTree import fromstring, indent, register_namespace, SubElement, tostring
 
 # Import the original processor but we'll modify its behavior
-from lambda_function import ClaudeNewsletterProcessor
+from lambda_function import ClaudeNewsletterProcessor, ITUNES_NAMESPACE
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Sample files above this size are decoded incrementally with ijson when available
+STREAMING_JSON_THRESHOLD_BYTES = 1_000_000
+
+register_namespace('itunes', ITUNES_NAMESPACE)
+
+# Channel metadata is identical on every local run; only the episode item changes
+_LOCAL_CHANNEL_TEMPLATE = (
+    f'<rss version="2.0" xmlns:itunes="{ITUNES_NAMESPACE}">'
+    '<channel>'
+    '<title>Daily AI, by AI (Local Development)</title>'
+    '<link>https://dailyaibyai.news</link>'
+    '<language>en-us</language>'
+    '<itunes:author>AI Newsletter Processor (Local)</itunes:author>'
+    '<description>Local development version of the Daily AI newsletter podcast. '
+    'Comprehensive analysis of AI developments, generated locally for testing.</description>'
+    '<itunes:explicit>false</itunes:explicit>'
+    '<itunes:category text="Technology"/>'
+    '<itunes:category text="News"/>'
+    '</channel>'
+    '</rss>'
+)
+
 class LocalNewsletterProcessor(ClaudeNewsletterProcessor):
     """
     Local version of the newsletter processor that:
@@ -38,15 +70,25 @@ class LocalNewsletterProcessor(ClaudeNewsletterProcessor):
         logger.info(f"📁 Sample emails: {self.sample_emails_dir}")
         logger.info(f"📁 Output directory: {self.output_dir}")
     
+    # Number of sample emails pulled through web enhancement at a time
+    ENHANCEMENT_BATCH_SIZE = 8
+    
     def process_newsletter_queue(self) -> Dict[str, Any]:
         """
         Main processing function - modified to read from local files
         """
         try:
-            # Get all sample email files
-            all_messages = self._load_sample_emails()
-            
-            if not all_messages:
+            # Stream sample emails through web enhancement in small batches so
+            # raw and enhanced copies of the whole directory are never held together
+            email_stream = self._iter_sample_emails()
+            enhanced_emails = []
+            while True:
+                batch = list(islice(email_stream, self.ENHANCEMENT_BATCH_SIZE))
+                if not batch:
+                    break
+                enhanced_emails.extend(self._enhance_emails_with_web_content(batch))
+            
+            if not enhanced_emails:
                 return {
                     'status': '📭 No sample emails found',
                     'total_emails': 0,
@@ -54,11 +96,9 @@ class LocalNewsletterProcessor(ClaudeNewsletterProcessor):
                     'processed_at': datetime.now().isoformat()
                 }
             
-            logger.info(f"📧 Processing {len(all_messages)} sample emails")
-            
-            # Use the same processing logic as the original
-            enhanced_emails = self._enhance_emails_with_web_content(all_messages)
+            logger.info(f"📧 Processing {len(enhanced_emails)} sample emails")
             
+            # Hybrid processing needs the full set for token estimation and batching
             # Apply hybrid processing strategy
             summary = self._hybrid_processing(enhanced_emails)
             
@@ -67,7 +107,7 @@ class LocalNewsletterProcessor(ClaudeNewsletterProcessor):
             if summary.get('podcast_content'):
                 audio_info = self._generate_podcast_audio_local(
                     summary['podcast_content'], 
-                    datetime.now().isoformat()
+                    self.run_timestamp.isoformat()
                 )
             
             # Save reports locally
@@ -106,36 +146,40 @@ class LocalNewsletterProcessor(ClaudeNewsletterProcessor):
                 'processed_at': datetime.now().isoformat()
             }
     
-    def _load_sample_emails(self) -> List[Dict[str, Any]]:
-        """Load sample emails from JSON files"""
-        emails = []
-        
+    def _iter_sample_emails(self) -> Iterator[Dict[str, Any]]:
+        """Yield sample emails from JSON files one at a time"""
         try:
             # Find all JSON files in sample emails directory
             json_files = list(self.sample_emails_dir.glob("*.json"))
-            
-            logger.info(f"📁 Found {len(json_files)} sample email files")
-            
-            for json_file in json_files:
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        email_data = json.load(f)
-                    
-                    # Add filename for reference
-                    email_data['source_file'] = json_file.name
-                    emails.append(email_data)
-                    
-                    logger.info(f"✅ Loaded: {json_file.name} - {email_data.get('newsletter_type', 'Unknown')}")
-                    
-                except Exception as e:
-                    logger.error(f"❌ Error loading {json_file}: {str(e)}")
-                    continue
-            
-            return emails
-            
         except Exception as e:
             logger.error(f"Error loading sample emails: {str(e)}")
-            return []
+            return
+        
+        logger.info("📁 Found %d sample email files", len(json_files))
+        
+        for json_file in json_files:
+            try:
+                email_data = self._read_sample_email(json_file)
+            except Exception as e:
+                logger.error("❌ Error loading %s: %s", json_file, e)
+                continue
+            
+            logger.info("✅ Loaded: %s - %s", json_file.name, email_data.get('newsletter_type', 'Unknown'))
+            
+            yield email_data
+    
+    def _read_sample_email(self, json_file: Path) -> Dict[str, Any]:
+        """Decode a sample email file, tagged with its filename for reference"""
+        if IJSON_AVAILABLE and json_file.stat().st_size > STREAMING_JSON_THRESHOLD_BYTES:
+            # Stream large files field by field
+            with open(json_file, 'rb') as f:
+                email_data = dict(ijson.kvitems(f, '', use_float=True))
+        else:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                email_data = json.load(f)
+        
+        email_data['source_file'] = json_file.name
+        return email_data
     
     def _generate_podcast_audio_local(self, podcast_content: str, processed_date: str) -> Optional[Dict[str, str]]:
         """Generate MP3 audio and save locally"""
@@ -156,26 +200,39 @@ class LocalNewsletterProcessor(ClaudeNewsletterProcessor):
                 f.write(clean_text)
             logger.info(f"💾 Saved podcast script: {text_file}")
             
-            # Convert to speech using remote Polly (parent method)
-            audio_data = self._convert_text_to_speech(clean_text)
-            
-            if not audio_data:
-                logger.warning("⚠️ No audio data generated")
-                return None
-            
-            # Save audio locally
             audio_file = self.output_dir / "audio" / f"ai_newsletter_podcast_{date_str}.mp3"
-            with open(audio_file, 'wb') as f:
-                f.write(audio_data)
             
-            logger.info(f"🎵 Saved audio file: {audio_file} ({len(audio_data)} bytes)")
+            # Reuse previously synthesized audio when the script is unchanged
+            content_hash = hashlib.sha256(clean_text.encode('utf-8')).hexdigest()
+            cached_audio_file = self.output_dir / "audio" / f"{content_hash}.mp3"
+            
+            if cached_audio_file.exists():
+                shutil.copyfile(cached_audio_file, audio_file)
+                audio_size = os.path.getsize(audio_file)
+                logger.info(f"♻️ Reused cached audio for unchanged script: {cached_audio_file}")
+            else:
+                # Convert to speech using remote Polly (parent method)
+                audio_data = self._convert_text_to_speech(clean_text)
+                
+                if not audio_data:
+                    logger.warning("⚠️ No audio data generated")
+                    return None
+                
+                # Save audio locally, plus a content-addressed copy for later reruns
+                with open(audio_file, 'wb') as f:
+                    f.write(audio_data)
+                with open(cached_audio_file, 'wb') as f:
+                    f.write(audio_data)
+                audio_size = len(audio_data)
+            
+            logger.info(f"🎵 Saved audio file: {audio_file} ({audio_size} bytes)")
             
             # Generate local RSS feed
-            self._generate_local_rss_feed(podcast_content, audio_file, len(audio_data), date_str)
+            self._generate_local_rss_feed(podcast_content, audio_file, audio_size, date_str)
             
             return {
                 'local_path': str(audio_file),
-                'audio_size': len(audio_data)
+                'audio_size': audio_size
             }
             
         except Exception as e:
@@ -185,25 +242,9 @@ class LocalNewsletterProcessor(ClaudeNewsletterProcessor):
     def _generate_local_rss_feed(self, podcast_content: str, audio_file: Path, audio_size: int, date_str: str):
         """Generate RSS feed XML and save locally"""
         try:
-            from xml.etree.ElementTree import Element, SubElement, tostring
-            from xml.dom import minidom
-            
-            # Create RSS structure
-            rss = Element("rss", version="2.0", attrib={"xmlns:itunes": "http://www.itunes.com/dtds/podcast-1.0.dtd"})
-            channel = SubElement(rss, "channel")
-            
-            # Channel metadata
-            SubElement(channel, "title").text = "Daily AI, by AI (Local Development)"
-            SubElement(channel, "link").text = "https://dailyaibyai.news"
-            SubElement(channel, "language").text = "en-us"
-            SubElement(channel, "itunes:author").text = "AI Newsletter Processor (Local)"
-            SubElement(channel, "description").text = (
-                "Local development version of the Daily AI newsletter podcast. "
-                "Comprehensive analysis of AI developments, generated locally for testing."
-            )
-            SubElement(channel, "itunes:explicit").text = "false"
-            SubElement(channel, "itunes:category", text="Technology")
-            SubElement(channel, "itunes:category", text="News")
+            # Start from the constant channel skeleton
+            rss = fromstring(_LOCAL_CHANNEL_TEMPLATE)
+            channel = rss.find("channel")
             
             # Episode item
             item = SubElement(channel, "item")
@@ -228,11 +269,11 @@ class LocalNewsletterProcessor(ClaudeNewsletterProcessor):
             pubdate = datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0000")
             SubElement(item, "pubDate").text = pubdate
             
-            SubElement(item, "itunes:duration").text = "10:00"
+            SubElement(item, f"{{{ITUNES_NAMESPACE}}}duration").text = "10:00"
             
-            # Convert to pretty XML
-            rss_bytes = tostring(rss, encoding="utf-8", xml_declaration=True)
-            pretty_xml = minidom.parseString(rss_bytes).toprettyxml(encoding="utf-8")
+            # Indent in place and serialize once
+            indent(rss, space="\t")
+            pretty_xml = tostring(rss, encoding="utf-8", xml_declaration=True)
             
             # Save RSS feed locally
             rss_file = self.output_dir / "rss" / f"podcast_feed_{date_str}.xml"
@@ -36,10 +36,9 @@ def check_environment():
         'AWS_DEFAULT_REGION'
     ]
     
-    missing_vars = []
-    for var in required_vars:
-        if not os.environ.get(var):
-            missing_vars.append(var)
+    # Snapshot the environment once instead of going through os.environ per lookup
+    env = dict(os.environ)
+    missing_vars = [var for var in required_vars if not env.get(var)]
     
     if missing_vars:
         logger.error("❌ Missing required environment variables:")
@@ -70,10 +69,11 @@ def setup_environment():
         'TEST_MODE': 'true'
     }
     
+    env = os.environ
     for key, value in env_defaults.items():
-        if not os.environ.get(key):
-            os.environ[key] = value
-            logger.info(f"🔧 Set {key}={value}")
+        if not env.get(key):
+            env[key] = value
+            logger.info("🔧 Set %s=%s", key, value)
 
 def main():
     parser = argparse.ArgumentParser(description='Run AI Newsletter Processor locally')
@@ -106,15 +106,17 @@ def main():
         logger.error("Please create sample email JSON files in the specified directory")
         sys.exit(1)
     
-    json_files = list(samples_dir.glob("*.json"))
+    with os.scandir(samples_dir) as entries:
+        json_files = [entry.name for entry in entries if entry.name.endswith('.json') and entry.is_file()]
     if not json_files:
         logger.error(f"❌ No JSON files found in: {samples_dir}")
         logger.error("Please add sample email JSON files to process")
         sys.exit(1)
     
-    logger.info(f"📧 Found {len(json_files)} sample email files:")
-    for json_file in json_files:
-        logger.info(f"   - {json_file.name}")
+    logger.info("📧 Found %d sample email files:", len(json_files))
+    if logger.isEnabledFor(logging.INFO):
+        for json_file in json_files:
+            logger.info("   - %s", json_file)
     
     try:
         # Import and run local processor
@@ -0,0 +1,32 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    from local_processor import LocalNewsletterProcessor
+    LOCAL_PROCESSOR_AVAILABLE = True
+except ImportError:
+    LOCAL_PROCESSOR_AVAILABLE = False
+
+
+@unittest.skipUnless(LOCAL_PROCESSOR_AVAILABLE, "Lambda dependencies (boto3) not installed")
+class LocalRssFeedTest(unittest.TestCase):
+    def test_feed_uses_itunes_prefix(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            processor = LocalNewsletterProcessor.__new__(LocalNewsletterProcessor)
+            processor.output_dir = Path(output_dir)
+            processor.podcast_title = "Daily AI, by AI"
+            (processor.output_dir / "rss").mkdir()
+
+            processor._generate_local_rss_feed(
+                "# Summary\nA short podcast script.", Path(output_dir) / "episode.mp3", 1234, "2025-01-01"
+            )
+
+            feed = (processor.output_dir / "rss" / "podcast_feed_2025-01-01.xml").read_text(encoding="utf-8")
+            self.assertIn("<itunes:duration>10:00</itunes:duration>", feed)
+            self.assertIn("<itunes:author>", feed)
+            self.assertNotIn("ns0:", feed)
+
+
+if __name__ == "__main__":
+    unittest.main()
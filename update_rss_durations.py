@@ -1,20 +1,31 @@
 #!/usr/bin/env python3
 """
 Script to update iTunes duration in RSS feeds based on actual MP3 file durations.
-Downloads MP3 files temporarily, extracts duration using mutagen, and updates RSS.
+Reads the MP3 headers from S3, extracts duration using mutagen, and updates RSS.
 """
 
 import boto3
+from botocore.config import Config
+import json
 import sys
 import os
 import tempfile
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from xml.etree.ElementTree import fromstring, tostring, register_namespace, SubElement
 from urllib.parse import urlparse
 
+from feed_common import FEED_CACHE_CONTROL
+
+# lxml when installed, stdlib otherwise
+try:
+    from lxml.etree import fromstring, tostring, register_namespace, SubElement
+except ImportError:
+    from xml.etree.ElementTree import fromstring, tostring, register_namespace, SubElement
+
 # Try to import mutagen
 try:
-    from mutagen.mp3 import MP3
+    from mutagen.mp3 import MP3, BitrateMode
 except ImportError:
     print("❌ Error: mutagen library is required")
     print("Install it with: pip install mutagen")
@@ -23,6 +34,21 @@ except ImportError:
 # Register iTunes namespace to preserve it in the XML
 register_namespace('itunes', "http://www.itunes.com/dtds/podcast-1.0.dtd")
 
+# Number of episode MP3s fetched from S3 concurrently
+DURATION_FETCH_WORKERS = 16
+
+# Pool sized above DURATION_FETCH_WORKERS so concurrent S3 requests never wait on a connection
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+
+# Leading bytes of each MP3 fetched to read frame and Xing/VBRI headers
+MP3_HEADER_RANGE_BYTES = 8192
+
+# S3 key of the {etag: duration_seconds} cache shared across runs
+DURATION_CACHE_KEY = 'backups/duration_cache.json'
+
 
 def format_duration(seconds: float) -> str:
     """
@@ -34,10 +60,8 @@ def format_duration(seconds: float) -> str:
     Returns:
         Formatted duration string
     """
-    total_seconds = int(seconds)
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    secs = total_seconds % 60
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
 
     if hours > 0:
         return f"{hours}:{minutes:02d}:{secs:02d}"
@@ -45,56 +69,218 @@ def format_duration(seconds: float) -> str:
         return f"{minutes}:{secs:02d}"
 
 
-def get_mp3_duration(s3_client, url: str) -> float:
+def parse_s3_url(url: str):
+    """
+    Split an S3 object URL into bucket and key.
+
+    Args:
+        url: URL to the S3 object
+
+    Returns:
+        (bucket, key) tuple, or None for unsupported URL formats
+    """
+    parsed = urlparse(url)
+
+    # Handle different S3 URL formats
+    if '.s3.amazonaws.com' in parsed.netloc or '.s3.' in parsed.netloc:
+        # Format: https://bucket.s3.region.amazonaws.com/key
+        # or: https://bucket.s3.amazonaws.com/key
+        return parsed.netloc.split('.')[0], parsed.path.lstrip('/')
+
+    return None
+
+
+def list_episode_objects(s3_client, urls: list) -> dict:
+    """
+    Index episode MP3 objects with one paginated listing per bucket.
+
+    Lists everything under the longest prefix shared by the episode keys, so
+    ETags come from a handful of LIST calls instead of one HEAD per episode.
+
+    Args:
+        s3_client: Boto3 S3 client
+        urls: Episode enclosure URLs
+
+    Returns:
+        Dict mapping (bucket, key) to the list_objects_v2 entry
+    """
+    keys_by_bucket = {}
+    for url in urls:
+        location = parse_s3_url(url)
+        if location:
+            keys_by_bucket.setdefault(location[0], []).append(location[1])
+
+    object_index = {}
+    for bucket, keys in keys_by_bucket.items():
+        prefix = os.path.commonprefix(keys)
+        if not prefix:
+            # No shared prefix; listing the whole bucket would cost more than HEADs
+            continue
+
+        try:
+            paginator = s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                for obj in page.get('Contents', []):
+                    object_index[(bucket, obj['Key'])] = obj
+        except Exception as e:
+            print(f"⚠️  Could not list s3://{bucket}/{prefix}, falling back to per-episode HEAD: {str(e)}")
+
+    return object_index
+
+
+def get_mp3_duration(s3_client, url: str, duration_cache: dict = None, object_index: dict = None) -> float:
     """
-    Download MP3 from S3 and get its duration.
+    Get the duration of an MP3 stored in S3.
+
+    Returns the cached duration when the object's ETag is already known,
+    otherwise reads only the MP3 header when possible, falling back to a
+    full download.
 
     Args:
         s3_client: Boto3 S3 client
         url: URL to the MP3 file
+        duration_cache: Optional {etag: duration_seconds} cache, updated in place
+        object_index: Optional {(bucket, key): listing entry} from list_episode_objects
 
     Returns:
         Duration in seconds, or None if failed
     """
     try:
         # Parse S3 URL to get bucket and key
-        parsed = urlparse(url)
-
-        # Handle different S3 URL formats
-        if '.s3.amazonaws.com' in parsed.netloc or '.s3.' in parsed.netloc:
-            # Format: https://bucket.s3.region.amazonaws.com/key
-            # or: https://bucket.s3.amazonaws.com/key
-            bucket = parsed.netloc.split('.')[0]
-            key = parsed.path.lstrip('/')
-        else:
+        location = parse_s3_url(url)
+        if location is None:
             print(f"   ⚠️  Unsupported URL format: {url}")
             return None
+        bucket, key = location
 
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-
-        try:
-            # Download from S3
-            s3_client.download_file(bucket, key, tmp_path)
+        etag = None
+        if duration_cache is not None:
+            listed = object_index.get(location) if object_index else None
+            etag = listed['ETag'] if listed else s3_client.head_object(Bucket=bucket, Key=key)['ETag']
+            if etag in duration_cache:
+                return duration_cache[etag]
 
-            # Get duration using mutagen
-            audio = MP3(tmp_path)
-            duration = audio.info.length
+        duration = read_mp3_duration(s3_client, bucket, key)
 
-            return duration
+        if etag is not None:
+            duration_cache[etag] = duration
 
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        return duration
 
     except Exception as e:
         print(f"   ⚠️  Error getting duration: {str(e)}")
         return None
 
 
-def update_rss_durations(bucket_name: str, feed_key: str, dry_run: bool = False):
+def read_mp3_duration(s3_client, bucket: str, key: str) -> float:
+    """
+    Read MP3 duration from S3, trying a header-only fetch before a full download.
+
+    Args:
+        s3_client: Boto3 S3 client
+        bucket: S3 bucket name
+        key: MP3 object key
+
+    Returns:
+        Duration in seconds
+    """
+    try:
+        return get_mp3_duration_from_header(s3_client, bucket, key)
+    except Exception as e:
+        print(f"   ⚠️  Header read failed ({str(e)}), downloading full MP3...")
+
+    # Create temporary file
+    with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp_file:
+        tmp_path = tmp_file.name
+
+    try:
+        # Download from S3
+        s3_client.download_file(bucket, key, tmp_path)
+
+        # Get duration using mutagen
+        audio = MP3(tmp_path)
+        return audio.info.length
+
+    finally:
+        # Clean up temporary file
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def get_mp3_duration_from_header(s3_client, bucket: str, key: str) -> float:
+    """
+    Get MP3 duration by fetching only the leading bytes of the file.
+
+    VBR/ABR files carry their length in the Xing/VBRI header; for constant
+    bitrate files the length is derived from the object size and bitrate.
+
+    Args:
+        s3_client: Boto3 S3 client
+        bucket: S3 bucket name
+        key: MP3 object key
+
+    Returns:
+        Duration in seconds
+    """
+    response = s3_client.get_object(
+        Bucket=bucket,
+        Key=key,
+        Range=f"bytes=0-{MP3_HEADER_RANGE_BYTES - 1}"
+    )
+    header_bytes = response['Body'].read()
+
+    # ContentRange looks like "bytes 0-8191/1234567"
+    total_size = int(response['ContentRange'].rsplit('/', 1)[1])
+
+    info = MP3(BytesIO(header_bytes)).info
+    if info.bitrate_mode in (BitrateMode.VBR, BitrateMode.ABR) or total_size <= len(header_bytes):
+        return info.length
+
+    return total_size * 8 / info.bitrate
+
+
+def load_duration_cache(s3_client, bucket_name: str) -> dict:
+    """
+    Load the ETag-keyed duration cache from S3.
+
+    Args:
+        s3_client: Boto3 S3 client
+        bucket_name: S3 bucket name
+
+    Returns:
+        Dict mapping MP3 ETags to durations in seconds (empty if none saved yet)
+    """
+    try:
+        cache_obj = s3_client.get_object(Bucket=bucket_name, Key=DURATION_CACHE_KEY)
+        return json.loads(cache_obj['Body'].read())
+    except s3_client.exceptions.NoSuchKey:
+        return {}
+    except Exception as e:
+        print(f"⚠️  Could not load duration cache, starting empty: {str(e)}")
+        return {}
+
+
+def save_duration_cache(s3_client, bucket_name: str, duration_cache: dict):
+    """
+    Save the ETag-keyed duration cache to S3.
+
+    Args:
+        s3_client: Boto3 S3 client
+        bucket_name: S3 bucket name
+        duration_cache: Dict mapping MP3 ETags to durations in seconds
+    """
+    try:
+        s3_client.put_object(
+            Bucket=bucket_name,
+            Key=DURATION_CACHE_KEY,
+            Body=json.dumps(duration_cache).encode('utf-8'),
+            ContentType='application/json'
+        )
+    except Exception as e:
+        print(f"⚠️  Could not save duration cache: {str(e)}")
+
+
+def update_rss_durations(bucket_name: str, feed_key: str, dry_run: bool = False, s3_client=None):
     """
     Update episode durations in RSS feed from actual MP3 files.
 
@@ -102,8 +288,10 @@ def update_rss_durations(bucket_name: str, feed_key: str, dry_run: bool = False)
         bucket_name: S3 bucket name
         feed_key: RSS feed file key
         dry_run: If True, only show what would be changed without updating
+        s3_client: Optional Boto3 S3 client to reuse across feeds
     """
-    s3_client = boto3.client('s3')
+    if s3_client is None:
+        s3_client = boto3.client('s3', config=S3_CLIENT_CONFIG)
 
     print(f"\n{'='*60}")
     print(f"Updating Episode Durations: {feed_key}")
@@ -125,16 +313,18 @@ def update_rss_durations(bucket_name: str, feed_key: str, dry_run: bool = False)
             return False
 
         # Get all items
-        items = channel.findall('item')
-        total_items = len(items)
-
-        print(f"📊 Processing {total_items} episode(s)...")
+        duration_cache = load_duration_cache(s3_client, bucket_name)
+        cached_count = len(duration_cache)
 
         updated_count = 0
         failed_count = 0
         updates = []
+        episodes = []
+        total_items = 0
 
-        for idx, item in enumerate(items, 1):
+        # Walk items lazily; only episodes with a usable enclosure are kept
+        for idx, item in enumerate(channel.iterfind('item'), 1):
+            total_items = idx
             enclosure = item.find('enclosure')
             duration_elem = item.find('{http://www.itunes.com/dtds/podcast-1.0.dtd}duration')
             title_elem = item.find('title')
@@ -151,35 +341,50 @@ def update_rss_durations(bucket_name: str, feed_key: str, dry_run: bool = False)
                 continue
 
             title = title_elem.text if title_elem is not None else f"Episode {idx}"
-            old_duration = duration_elem.text if duration_elem is not None else "unknown"
+            episodes.append((idx, item, duration_elem, title, url))
 
-            print(f"   📥 {idx}/{total_items}: Downloading {title[:50]}...")
+        print(f"📊 Processing {total_items} episode(s)...")
+        print(f"📥 Reading durations for {len(episodes)} MP3 file(s)...")
 
-            # Get actual duration from MP3
-            duration_seconds = get_mp3_duration(s3_client, url)
+        object_index = list_episode_objects(s3_client, [episode[4] for episode in episodes])
 
-            if duration_seconds is None:
-                failed_count += 1
-                continue
+        # Fetch durations concurrently; XML is only mutated from this thread
+        with ThreadPoolExecutor(max_workers=DURATION_FETCH_WORKERS) as executor:
+            durations = executor.map(
+                lambda episode: get_mp3_duration(s3_client, episode[4], duration_cache, object_index),
+                episodes
+            )
+
+            for (idx, item, duration_elem, title, url), duration_seconds in zip(episodes, durations):
+                old_duration = duration_elem.text if duration_elem is not None else "unknown"
 
-            new_duration = format_duration(duration_seconds)
-
-            # Update or create duration element
-            if duration_elem is None:
-                # Create new duration element
-                duration_elem = SubElement(item, '{http://www.itunes.com/dtds/podcast-1.0.dtd}duration')
-
-            if old_duration != new_duration:
-                duration_elem.text = new_duration
-                updated_count += 1
-                updates.append({
-                    'title': title,
-                    'old_duration': old_duration,
-                    'new_duration': new_duration
-                })
-                print(f"      ✓ Duration: {old_duration} → {new_duration}")
-            else:
-                print(f"      ✓ Duration already correct: {new_duration}")
+                print(f"   📥 {idx}/{total_items}: {title[:50]}...")
+
+                if duration_seconds is None:
+                    failed_count += 1
+                    continue
+
+                new_duration = format_duration(duration_seconds)
+
+                # Update or create duration element
+                if duration_elem is None:
+                    # Create new duration element
+                    duration_elem = SubElement(item, '{http://www.itunes.com/dtds/podcast-1.0.dtd}duration')
+
+                if old_duration != new_duration:
+                    duration_elem.text = new_duration
+                    updated_count += 1
+                    updates.append({
+                        'title': title,
+                        'old_duration': old_duration,
+                        'new_duration': new_duration
+                    })
+                    print(f"      ✓ Duration: {old_duration} → {new_duration}")
+                else:
+                    print(f"      ✓ Duration already correct: {new_duration}")
+
+        if not dry_run and len(duration_cache) != cached_count:
+            save_duration_cache(s3_client, bucket_name, duration_cache)
 
         # Show summary of updates
         if updates:
@@ -205,28 +410,31 @@ def update_rss_durations(bucket_name: str, feed_key: str, dry_run: bool = False)
             print("\n⚠️  DRY RUN MODE - No changes uploaded to S3")
             return True
 
+        # Convert to XML
+        rss_bytes = tostring(rss, encoding="utf-8", xml_declaration=True)
+
         # Create backup before uploading
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_key = f"backups/{feed_key.replace('.xml', '')}_duration_backup_{timestamp}.xml"
+        feed_stem, _ = os.path.splitext(feed_key)
+        backup_key = f"backups/{feed_stem}_duration_backup_{timestamp}.xml"
 
         print(f"\n💾 Creating backup at s3://{bucket_name}/{backup_key}...")
-        s3_client.put_object(
+        s3_client.copy_object(
             Bucket=bucket_name,
             Key=backup_key,
-            Body=original_content,
-            ContentType='application/rss+xml'
+            CopySource={'Bucket': bucket_name, 'Key': feed_key},
+            CopySourceIfMatch=feed_obj['ETag'],
+            MetadataDirective='COPY'
         )
 
-        # Convert to XML
-        rss_bytes = tostring(rss, encoding="utf-8", xml_declaration=True)
-
         # Upload updated feed
         print(f"📤 Uploading updated RSS feed to S3...")
         s3_client.put_object(
             Bucket=bucket_name,
             Key=feed_key,
             Body=rss_bytes,
-            ContentType='application/rss+xml'
+            ContentType='application/rss+xml',
+            CacheControl=FEED_CACHE_CONTROL
         )
 
         print(f"✅ Successfully updated episode durations in: {feed_key}")
@@ -285,16 +493,19 @@ def main():
     success_count = 0
     total_count = 0
 
+    # One client (and connection pool) shared by every feed update
+    s3_client = boto3.client('s3', config=S3_CLIENT_CONFIG)
+
     # Update staging
     if update_staging:
         total_count += 1
-        if update_rss_durations(args.bucket, 'feed-staging.xml', args.dry_run):
+        if update_rss_durations(args.bucket, 'feed-staging.xml', args.dry_run, s3_client):
             success_count += 1
 
     # Update production
     if update_production:
         total_count += 1
-        if update_rss_durations(args.bucket, 'feed.xml', args.dry_run):
+        if update_rss_durations(args.bucket, 'feed.xml', args.dry_run, s3_client):
             success_count += 1
 
     # Summary
@@ -5,15 +5,46 @@ Matches episodes by date extracted from GUID and updates titles.
 Backs up original feeds before making changes.
 """
 
-import boto3
+import functools
+import os
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import sys
-from datetime import datetime
-from xml.etree.ElementTree import fromstring, tostring, register_namespace
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from feed_common import AWS_CLIENT_CONFIG, FEED_CACHE_CONTROL, SESSION_LOCK, get_session
+
+# lxml when installed, stdlib otherwise
+try:
+    from lxml.etree import iterparse, tostring, register_namespace
+except ImportError:
+    from xml.etree.ElementTree import iterparse, tostring, register_namespace
 
 # Register iTunes namespace to preserve it in the XML
 register_namespace('itunes', "http://www.itunes.com/dtds/podcast-1.0.dtd")
 
+# Parallel scan segments; each worker gets its own resource and connection pool
+DYNAMODB_SCAN_SEGMENTS = 8
+DYNAMODB_CONFIG = AWS_CLIENT_CONFIG.merge(Config(max_pool_connections=max(32, DYNAMODB_SCAN_SEGMENTS * 2)))
+
+# Feeds with more dates than this are served by a full parallel scan instead of BatchGetItem
+BATCH_GET_MAX_DATES = 1000
+BATCH_GET_CHUNK_SIZE = 100  # BatchGetItem limit per request
+BATCH_GET_MAX_RETRIES = 5
+
+# Number of title changes echoed in the summary
+UPDATE_SAMPLE_SIZE = 5
+
+# Attempts at the read-modify-write cycle when the feed changes underneath us
+FEED_UPDATE_ATTEMPTS = 3
+
+# Known GUID prefixes, longest first so staging GUIDs are not matched as production
+GUID_PREFIXES = ('staging-daily-ai-', 'daily-ai-')
+
 
+@functools.lru_cache(maxsize=4096)
 def extract_date_from_guid(guid: str) -> str:
     """
     Extract date from GUID.
@@ -23,61 +54,84 @@ def extract_date_from_guid(guid: str) -> str:
     if not guid:
         return None
 
-    # Remove prefix to get the date part
-    date_part = guid.replace('staging-daily-ai-', '').replace('daily-ai-', '')
-
-    # Should be YYYYMMDD (8 digits)
-    if len(date_part) == 8 and date_part.isdigit():
-        return f"{date_part[0:4]}-{date_part[4:6]}-{date_part[6:8]}"
+    for prefix in GUID_PREFIXES:
+        if guid.startswith(prefix):
+            # Should be YYYYMMDD (8 digits)
+            date_part = guid[len(prefix):]
+            if len(date_part) == 8 and date_part.isdigit():
+                return '-'.join((date_part[:4], date_part[4:6], date_part[6:]))
+            return None
 
     return None
 
 
-def get_titles_from_dynamodb(table_name: str) -> dict:
+def _scan_segment(session, table_name: str, segment: int, total_segments: int) -> dict:
     """
-    Fetch all episode titles from DynamoDB table.
+    Scan one segment of a parallel DynamoDB scan for episode titles.
 
     Args:
+        session: Shared boto3 Session used to create this worker's resource
         table_name: DynamoDB table name
+        segment: Segment number handled by this worker
+        total_segments: Total number of scan segments
 
     Returns:
-        Dictionary mapping date (YYYY-MM-DD) to episode_title
+        Dictionary mapping date (YYYY-MM-DD) to episode_title for this segment
     """
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table(table_name)
-
-    print(f"📥 Scanning DynamoDB table: {table_name}...")
+    # Resources are not thread-safe, so each worker builds its own
+    with SESSION_LOCK:
+        table = session.resource('dynamodb', config=DYNAMODB_CONFIG).Table(table_name)
 
     titles = {}
     scan_kwargs = {
         'ProjectionExpression': '#d, episode_title',
-        'ExpressionAttributeNames': {'#d': 'date'}
+        'ExpressionAttributeNames': {'#d': 'date'},
+        'Segment': segment,
+        'TotalSegments': total_segments
     }
 
-    try:
-        done = False
-        start_key = None
-        count = 0
+    while True:
+        response = table.scan(**scan_kwargs)
+
+        for item in response.get('Items', []):
+            date = item.get('date')
+            episode_title = item.get('episode_title')
+
+            if date and episode_title:
+                titles[date] = episode_title
 
-        while not done:
-            if start_key:
-                scan_kwargs['ExclusiveStartKey'] = start_key
+        start_key = response.get('LastEvaluatedKey')
+        if start_key is None:
+            return titles
+        scan_kwargs['ExclusiveStartKey'] = start_key
 
-            response = table.scan(**scan_kwargs)
-            items = response.get('Items', [])
 
-            for item in items:
-                date = item.get('date')
-                episode_title = item.get('episode_title')
+def get_titles_from_dynamodb(table_name: str, session=None) -> dict:
+    """
+    Fetch all episode titles from DynamoDB table using a parallel scan.
+
+    Args:
+        table_name: DynamoDB table name
+        session: Optional boto3 Session to create clients from
 
-                if date and episode_title:
-                    titles[date] = episode_title
-                    count += 1
+    Returns:
+        Dictionary mapping date (YYYY-MM-DD) to episode_title
+    """
+    session = session or get_session()
 
-            start_key = response.get('LastEvaluatedKey', None)
-            done = start_key is None
+    print(f"📥 Scanning DynamoDB table: {table_name} ({DYNAMODB_SCAN_SEGMENTS} segments)...")
 
-        print(f"   Found {count} records with episode_title")
+    try:
+        titles = {}
+        with ThreadPoolExecutor(max_workers=DYNAMODB_SCAN_SEGMENTS) as executor:
+            futures = [
+                executor.submit(_scan_segment, session, table_name, segment, DYNAMODB_SCAN_SEGMENTS)
+                for segment in range(DYNAMODB_SCAN_SEGMENTS)
+            ]
+            for future in futures:
+                titles.update(future.result())
+
+        print(f"   Found {len(titles)} records with episode_title")
         return titles
 
     except Exception as e:
@@ -85,18 +139,155 @@ def get_titles_from_dynamodb(table_name: str) -> dict:
         return {}
 
 
-def update_rss_titles(bucket_name: str, feed_key: str, titles_map: dict, dry_run: bool = False):
+def _batch_get_titles(session, table_name: str, dates: list) -> dict:
+    """
+    Fetch episode titles for up to 100 dates with BatchGetItem.
+
+    Args:
+        session: Shared boto3 Session used to create this worker's resource
+        table_name: DynamoDB table name
+        dates: Dates (YYYY-MM-DD) to look up
+
+    Returns:
+        Dictionary mapping date (YYYY-MM-DD) to episode_title
+    """
+    with SESSION_LOCK:
+        dynamodb = session.resource('dynamodb', config=DYNAMODB_CONFIG)
+
+    titles = {}
+    request_items = {
+        table_name: {
+            'Keys': [{'date': date} for date in dates],
+            'ProjectionExpression': '#d, episode_title',
+            'ExpressionAttributeNames': {'#d': 'date'}
+        }
+    }
+
+    for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+        response = dynamodb.batch_get_item(RequestItems=request_items)
+
+        for item in response.get('Responses', {}).get(table_name, []):
+            date = item.get('date')
+            episode_title = item.get('episode_title')
+
+            if date and episode_title:
+                titles[date] = episode_title
+
+        request_items = response.get('UnprocessedKeys')
+        if not request_items:
+            return titles
+
+        # Throttled keys come back unprocessed; back off before retrying them
+        time.sleep(min(0.05 * (2 ** attempt), 2))
+
+    raise RuntimeError(f"BatchGetItem left keys unprocessed after {BATCH_GET_MAX_RETRIES} retries")
+
+
+def get_titles_for_dates(table_name: str, dates: set, session=None) -> dict:
+    """
+    Fetch episode titles for specific dates from DynamoDB.
+
+    Uses parallel BatchGetItem requests, or a full parallel scan when the
+    feed references more dates than BATCH_GET_MAX_DATES.
+
+    Args:
+        table_name: DynamoDB table name
+        dates: Dates (YYYY-MM-DD) referenced by the RSS feed
+        session: Optional boto3 Session to create clients from
+
+    Returns:
+        Dictionary mapping date (YYYY-MM-DD) to episode_title, or None on error
+    """
+    if len(dates) > BATCH_GET_MAX_DATES:
+        return get_titles_from_dynamodb(table_name, session) or None
+
+    session = session or get_session()
+    sorted_dates = sorted(dates)
+    chunks = [
+        sorted_dates[i:i + BATCH_GET_CHUNK_SIZE]
+        for i in range(0, len(sorted_dates), BATCH_GET_CHUNK_SIZE)
+    ]
+
+    print(f"📥 Fetching titles for {len(dates)} date(s) from DynamoDB table: {table_name}...")
+
+    if not chunks:
+        return {}
+
+    try:
+        titles = {}
+        with ThreadPoolExecutor(max_workers=min(DYNAMODB_SCAN_SEGMENTS, len(chunks))) as executor:
+            for chunk_titles in executor.map(lambda chunk: _batch_get_titles(session, table_name, chunk), chunks):
+                titles.update(chunk_titles)
+
+        print(f"   Found {len(titles)} records with episode_title")
+        return titles
+
+    except Exception as e:
+        print(f"❌ Error fetching titles from DynamoDB table: {str(e)}")
+        return None
+
+
+class FeedChangedError(Exception):
+    """Raised when the feed was modified between our GET and conditional PUT."""
+
+    def __init__(self, feed_key: str, backup_taken: bool = False):
+        super().__init__(feed_key)
+        self.backup_taken = backup_taken
+
+
+def update_rss_titles(bucket_name: str, feed_key: str, titles_map: dict, dry_run: bool = False, *,
+                      s3_client=None, backup_timestamp: str = None):
     """
     Update episode titles in RSS feed from DynamoDB titles.
 
+    The feed is written with an ETag-conditional PUT; if someone else updated
+    it in the meantime, the feed is re-fetched and the titles re-applied. The
+    version being rewritten is backed up once, only when titles change.
+
     Args:
         bucket_name: S3 bucket name
         feed_key: RSS feed file key
-        titles_map: Dictionary mapping date to episode_title
+        titles_map: Dictionary mapping date to episode_title, or a callable that
+            takes the set of dates found in the feed and returns that dictionary
+            (None on failure)
         dry_run: If True, only show what would be changed without updating
+        s3_client: Optional Boto3 S3 client to reuse across feeds
+        backup_timestamp: Optional UTC timestamp (YYYYMMDD_HHMMSS) for the backup key,
+            shared across feeds updated in the same run
     """
-    s3_client = boto3.client('s3')
+    if backup_timestamp is None:
+        backup_timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
 
+    if s3_client is None:
+        session = get_session()
+        with SESSION_LOCK:
+            s3_client = session.client('s3', config=AWS_CLIENT_CONFIG)
+
+    feed_stem, _ = os.path.splitext(feed_key)
+    backup_key = f"backups/{feed_stem}_titles_backup_{backup_timestamp}.xml"
+
+    # The first backup is the pre-run feed; retries must not overwrite it
+    take_backup = True
+    for attempt in range(1, FEED_UPDATE_ATTEMPTS + 1):
+        try:
+            return _update_rss_titles_once(bucket_name, feed_key, titles_map, dry_run, s3_client,
+                                           backup_key, take_backup)
+        except FeedChangedError as e:
+            take_backup = take_backup and not e.backup_taken
+            print(f"⚠️  {feed_key} changed during the update (attempt {attempt}/{FEED_UPDATE_ATTEMPTS}), retrying...")
+
+    print(f"❌ Gave up updating {feed_key}: it kept changing during the update")
+    return False
+
+
+def _update_rss_titles_once(bucket_name: str, feed_key: str, titles_map, dry_run: bool, s3_client,
+                            backup_key: str, take_backup: bool) -> bool:
+    """
+    Run one read-modify-write cycle of update_rss_titles.
+
+    Raises:
+        FeedChangedError: If the backup copy or conditional feed PUT fails because the feed changed
+    """
     print(f"\n{'='*60}")
     print(f"Updating Episode Titles: {feed_key}")
     print(f"Bucket: {bucket_name}")
@@ -106,35 +297,37 @@ def update_rss_titles(bucket_name: str, feed_key: str, titles_map: dict, dry_run
         # Download existing RSS feed
         print(f"📥 Downloading RSS feed from s3://{bucket_name}/{feed_key}...")
         feed_obj = s3_client.get_object(Bucket=bucket_name, Key=feed_key)
-        original_content = feed_obj['Body'].read()
-
-        # Parse XML
-        rss = fromstring(original_content)
-        channel = rss.find('channel')
-
-        if channel is None:
-            print("❌ Error: No <channel> element found in RSS feed")
-            return False
-
-        # Get all items
-        items = channel.findall('item')
-        total_items = len(items)
-
-        print(f"📊 Processing {total_items} episode(s)...")
+        feed_etag = feed_obj['ETag']
 
         updated_count = 0
         not_found_count = 0
-        updates = []
+        total_items = 0
+        updates_sample = []
+        title_updates = []
+        episodes = []
+
+        # Parse straight from the response stream, collecting each item's title and date as it closes
+        context = iterparse(feed_obj['Body'], events=('end',))
+        for _, item in context:
+            if item.tag != 'item':
+                continue
 
-        for item in items:
-            guid_elem = item.find('guid')
-            title_elem = item.find('title')
+            total_items += 1
+
+            # One walk over the item's children finds both elements
+            guid_elem = title_elem = None
+            for child in item:
+                if child.tag == 'guid':
+                    if guid_elem is None:
+                        guid_elem = child
+                elif child.tag == 'title':
+                    if title_elem is None:
+                        title_elem = child
 
             if guid_elem is None or title_elem is None:
                 continue
 
             guid = guid_elem.text
-            old_title = title_elem.text
             date = extract_date_from_guid(guid)
 
             if not date:
@@ -142,31 +335,51 @@ def update_rss_titles(bucket_name: str, feed_key: str, titles_map: dict, dry_run
                 not_found_count += 1
                 continue
 
+            episodes.append((title_elem, guid, date))
+
+        # The full tree is kept, since the updated feed is re-serialized below
+        rss = context.root
+        if rss.find('channel') is None:
+            print("❌ Error: No <channel> element found in RSS feed")
+            return False
+
+        print(f"📊 Processed {total_items} episode(s)...")
+
+        # Look up only the dates this feed actually references
+        if callable(titles_map):
+            titles_map = titles_map({date for _, _, date in episodes})
+            if titles_map is None:
+                return False
+
+        for title_elem, guid, date in episodes:
+            old_title = title_elem.text
             new_title = titles_map.get(date)
 
             if new_title:
                 if old_title != new_title:
-                    title_elem.text = new_title
+                    # Only record the change; the tree is patched once uploading is certain
+                    title_updates.append((title_elem, new_title))
                     updated_count += 1
-                    updates.append({
-                        'date': date,
-                        'guid': guid,
-                        'old_title': old_title,
-                        'new_title': new_title
-                    })
+                    if len(updates_sample) < UPDATE_SAMPLE_SIZE:
+                        updates_sample.append({
+                            'date': date,
+                            'guid': guid,
+                            'old_title': old_title,
+                            'new_title': new_title
+                        })
             else:
                 not_found_count += 1
 
         # Show sample updates
-        if updates:
-            print(f"\n🔄 Title updates (showing first 5):")
-            for update in updates[:5]:
+        if updates_sample:
+            print(f"\n🔄 Title updates (showing first {UPDATE_SAMPLE_SIZE}):")
+            for update in updates_sample:
                 print(f"\n   📅 {update['date']} ({update['guid']}):")
                 print(f"      Old: {update['old_title']}")
                 print(f"      New: {update['new_title']}")
 
-            if len(updates) > 5:
-                print(f"\n   ... and {len(updates) - 5} more")
+            if updated_count > UPDATE_SAMPLE_SIZE:
+                print(f"\n   ... and {updated_count - UPDATE_SAMPLE_SIZE} more")
 
         print(f"\n📊 Update summary:")
         print(f"   - Total episodes: {total_items}")
@@ -181,35 +394,47 @@ def update_rss_titles(bucket_name: str, feed_key: str, titles_map: dict, dry_run
             print("\n⚠️  DRY RUN MODE - No changes uploaded to S3")
             return True
 
-        # Create backup before uploading
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_key = f"backups/{feed_key.replace('.xml', '')}_titles_backup_{timestamp}.xml"
-
-        print(f"\n💾 Creating backup at s3://{bucket_name}/{backup_key}...")
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=backup_key,
-            Body=original_content,
-            ContentType='application/rss+xml'
-        )
+        # Apply the planned title changes and serialize
+        for title_elem, new_title in title_updates:
+            title_elem.text = new_title
 
-        # Convert to XML
         rss_bytes = tostring(rss, encoding="utf-8", xml_declaration=True)
 
-        # Upload updated feed
-        print(f"📤 Uploading updated RSS feed to S3...")
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=feed_key,
-            Body=rss_bytes,
-            ContentType='application/rss+xml'
-        )
+        # Both steps are pinned to the feed version we read, so concurrent edits are never overwritten
+        backup_taken = False
+        try:
+            if take_backup:
+                print(f"\n💾 Creating backup at s3://{bucket_name}/{backup_key}...")
+                s3_client.copy_object(
+                    Bucket=bucket_name,
+                    Key=backup_key,
+                    CopySource={'Bucket': bucket_name, 'Key': feed_key},
+                    CopySourceIfMatch=feed_etag,
+                    MetadataDirective='COPY'
+                )
+                backup_taken = True
+
+            print(f"\n📤 Uploading updated RSS feed to S3...")
+            s3_client.put_object(
+                Bucket=bucket_name,
+                Key=feed_key,
+                Body=rss_bytes,
+                ContentType='application/rss+xml',
+                CacheControl=FEED_CACHE_CONTROL,
+                IfMatch=feed_etag
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                raise FeedChangedError(feed_key, backup_taken) from e
+            raise
 
         print(f"✅ Successfully updated episode titles in: {feed_key}")
         print(f"   Backup saved to: {backup_key}")
 
         return True
 
+    except FeedChangedError:
+        raise
     except Exception as e:
         print(f"❌ Error updating RSS feed titles: {str(e)}")
         import traceback
@@ -217,6 +442,33 @@ def update_rss_titles(bucket_name: str, feed_key: str, titles_map: dict, dry_run
         return False
 
 
+def update_feed_titles(session, s3_client, bucket_name: str, table_name: str, feed_key: str, dry_run: bool,
+                       backup_timestamp: str = None) -> bool:
+    """
+    Apply titles from one DynamoDB table to its RSS feed, fetching only the dates the feed uses.
+
+    Args:
+        session: Shared boto3 Session for DynamoDB resources
+        s3_client: Shared Boto3 S3 client
+        bucket_name: S3 bucket name
+        table_name: DynamoDB table name
+        feed_key: RSS feed file key
+        dry_run: If True, only show what would be changed without updating
+        backup_timestamp: Optional UTC timestamp shared by this run's backup keys
+
+    Returns:
+        True if the feed was processed successfully
+    """
+    return update_rss_titles(
+        bucket_name,
+        feed_key,
+        lambda dates: get_titles_for_dates(table_name, dates, session),
+        dry_run,
+        s3_client=s3_client,
+        backup_timestamp=backup_timestamp
+    )
+
+
 def main():
     """Main function to update RSS titles from DynamoDB."""
     import argparse
@@ -258,22 +510,30 @@ def main():
             print("Invalid choice. Exiting.")
             sys.exit(1)
 
-    success_count = 0
-    total_count = 0
-
-    # Update staging
+    feeds = []
     if update_staging:
-        total_count += 1
-        titles = get_titles_from_dynamodb('ai_daily_news_staging')
-        if titles and update_rss_titles(args.bucket, 'feed-staging.xml', titles, args.dry_run):
-            success_count += 1
-
-    # Update production
+        feeds.append(('ai_daily_news_staging', 'feed-staging.xml'))
     if update_production:
-        total_count += 1
-        titles = get_titles_from_dynamodb('ai_daily_news')
-        if titles and update_rss_titles(args.bucket, 'feed.xml', titles, args.dry_run):
-            success_count += 1
+        feeds.append(('ai_daily_news', 'feed.xml'))
+
+    # One session and S3 client (clients are thread-safe) shared by every feed update
+    session = get_session()
+    s3_client = session.client('s3', config=AWS_CLIENT_CONFIG)
+
+    # One UTC timestamp so backups from the same run share a key suffix
+    backup_timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
+
+    # Staging and production are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=len(feeds)) as executor:
+        results = list(executor.map(
+            lambda feed: update_feed_titles(
+                session, s3_client, args.bucket, feed[0], feed[1], args.dry_run, backup_timestamp
+            ),
+            feeds
+        ))
+
+    success_count = sum(1 for result in results if result)
+    total_count = len(feeds)
 
     # Summary
     print(f"\n{'='*60}")
@@ -4,16 +4,22 @@ One-time script to update the website link in existing RSS feeds on S3.
 Updates both production and staging RSS feeds.
 """
 
-import boto3
 import os
 import sys
-from xml.etree.ElementTree import fromstring, tostring, register_namespace
-from xml.dom import minidom
+
+from feed_common import AWS_CLIENT_CONFIG, FEED_CACHE_CONTROL, get_session
+
+# lxml when installed, stdlib otherwise
+try:
+    from lxml.etree import fromstring, tostring, register_namespace, indent
+except ImportError:
+    from xml.etree.ElementTree import fromstring, tostring, register_namespace, indent
 
 # Register iTunes namespace to preserve it in the XML
 register_namespace('itunes', "http://www.itunes.com/dtds/podcast-1.0.dtd")
 
-def update_rss_link(bucket_name: str, feed_key: str, new_website_url: str, dry_run: bool = False):
+
+def update_rss_link(bucket_name: str, feed_key: str, new_website_url: str, dry_run: bool = False, *, s3_client=None):
     """
     Update the website link in an RSS feed stored in S3.
 
@@ -22,8 +28,10 @@ def update_rss_link(bucket_name: str, feed_key: str, new_website_url: str, dry_r
         feed_key: RSS feed file key (e.g., 'feed.xml')
         new_website_url: New website URL to set
         dry_run: If True, only show what would be changed without updating
+        s3_client: Optional Boto3 S3 client to reuse across feeds
     """
-    s3_client = boto3.client('s3')
+    if s3_client is None:
+        s3_client = get_session().client('s3', config=AWS_CLIENT_CONFIG)
 
     print(f"\n{'='*60}")
     print(f"Bucket: {bucket_name}")
@@ -67,9 +75,9 @@ def update_rss_link(bucket_name: str, feed_key: str, new_website_url: str, dry_r
             print("\n⚠️  DRY RUN MODE - No changes uploaded to S3")
             return True
 
-        # Convert to pretty XML
-        rss_bytes = tostring(rss, encoding="utf-8", xml_declaration=True)
-        pretty_xml = minidom.parseString(rss_bytes).toprettyxml(encoding="utf-8")
+        # Convert to pretty XML in place, without a second parse through minidom
+        indent(rss, space="\t")
+        pretty_xml = tostring(rss, encoding="utf-8", xml_declaration=True)
 
         # Upload updated feed back to S3
         print(f"\nUploading updated RSS feed to S3...")
@@ -77,7 +85,8 @@ def update_rss_link(bucket_name: str, feed_key: str, new_website_url: str, dry_r
             Bucket=bucket_name,
             Key=feed_key,
             Body=pretty_xml,
-            ContentType='application/rss+xml'
+            ContentType='application/rss+xml',
+            CacheControl=FEED_CACHE_CONTROL
         )
 
         print(f"✅ Successfully updated RSS feed link in s3://{bucket_name}/{feed_key}")
@@ -138,18 +147,21 @@ def main():
     success_count = 0
     total_count = 0
 
+    # One S3 client (and connection pool) shared by every feed update
+    s3_client = get_session().client('s3', config=AWS_CLIENT_CONFIG)
+
     # Update staging
     if update_staging:
         total_count += 1
         staging_bucket = args.bucket or os.environ.get('PODCAST_S3_BUCKET_STAGING', 'ai-newsletter-podcasts-staging')
-        if update_rss_link(staging_bucket, args.feed_key, args.new_url, args.dry_run):
+        if update_rss_link(staging_bucket, args.feed_key, args.new_url, args.dry_run, s3_client=s3_client):
             success_count += 1
 
     # Update production
     if update_production:
         total_count += 1
         prod_bucket = args.bucket or os.environ.get('PODCAST_S3_BUCKET', 'ai-newsletter-podcasts')
-        if update_rss_link(prod_bucket, args.feed_key, args.new_url, args.dry_run):
+        if update_rss_link(prod_bucket, args.feed_key, args.new_url, args.dry_run, s3_client=s3_client):
             success_count += 1
 
     # Summary